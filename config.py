@@ -41,6 +41,11 @@ SECRET_KEY = _secret_key
 # Supported Image Extensions
 IMG_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.jxl')
 
+# --- Scanning ---
+# Run Phase 2 (page listing + thumbnails) in worker processes instead of threads.
+# Zip/RAR header parsing holds the GIL, so processes scale better on many-core hosts.
+VIBE_SCAN_PROCESSES = os.environ.get("VIBE_SCAN_PROCESSES", "false").lower() == "true"
+
 # --- AI Configuration ---
 # AI provider (openai, anthropic, etc.)
 VIBE_AI_PROVIDER = os.environ.get("VIBE_AI_PROVIDER", "openai")
@@ -16,16 +16,29 @@ def delete_comics_by_ids(comic_ids: List[str], conn: Optional[sqlite3.Connection
         conn.commit()
         conn.close()
 
-def get_pending_comics(limit: int = 100, conn: Optional[sqlite3.Connection] = None) -> List[Dict[str, Any]]:
-    """Get comics that need page counting or thumbnail extraction"""
+def get_pending_comics(limit: int = 100, conn: Optional[sqlite3.Connection] = None, after_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Get comics that need page counting or thumbnail extraction.
+    
+    Pass the last id seen as after_id to page through them in id order
+    without depending on earlier results having been written back yet.
+    """
     own_conn = conn is None
     if own_conn:
         conn = get_db_connection()
-    comics = conn.execute('''
-        SELECT id, path FROM comics 
-        WHERE processed = 0 
-        LIMIT ?
-    ''', (limit,)).fetchall()
+    if after_id is None:
+        comics = conn.execute('''
+            SELECT id, path FROM comics 
+            WHERE processed = 0 
+            ORDER BY id
+            LIMIT ?
+        ''', (limit,)).fetchall()
+    else:
+        comics = conn.execute('''
+            SELECT id, path FROM comics 
+            WHERE processed = 0 AND id > ?
+            ORDER BY id
+            LIMIT ?
+        ''', (after_id, limit)).fetchall()
     if own_conn:
         conn.close()
     return [dict(c) for c in comics]
@@ -1,17 +1,97 @@
 import sqlite3
 import os
+import threading
 from datetime import datetime
 from config import DB_PATH
 
 # Schema version for migration tracking
-SCHEMA_VERSION = 16
+SCHEMA_VERSION = 20
+
+class PooledConnection:
+    """Checked-out pooled connection; close() hands it back instead of closing."""
+    
+    def __init__(self, pool: 'ConnectionPool', conn: sqlite3.Connection):
+        object.__setattr__(self, '_pool', pool)
+        object.__setattr__(self, '_conn', conn)
+    
+    def close(self) -> None:
+        conn = self._conn
+        if conn is not None:
+            object.__setattr__(self, '_conn', None)
+            self._pool.release(conn)
+    
+    def __enter__(self):
+        return self._conn.__enter__()
+    
+    def __exit__(self, *exc):
+        return self._conn.__exit__(*exc)
+    
+    def __getattr__(self, name):
+        if self._conn is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        return getattr(self._conn, name)
+    
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
 
-def get_db_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH, timeout=30)
-    conn.row_factory = sqlite3.Row
-    # Ensure WAL mode is active for this connection
-    conn.execute('PRAGMA journal_mode=WAL')
-    return conn
+
+class ConnectionPool:
+    """Per-thread pool of configured SQLite connections.
+    
+    Opening a connection and applying PRAGMAs on every call is a measurable
+    share of a request, so connections are kept open and reused. Each thread
+    keeps its own free list (sqlite3 connections are thread-bound), and nested
+    checkouts get distinct connections so one caller's close() can never roll
+    back another's open transaction.
+    """
+    
+    def __init__(self, path: str, max_idle: int = 4):
+        self.path = path
+        self.max_idle = max_idle
+        self._local = threading.local()
+    
+    def _free_list(self) -> list:
+        local = self._local
+        # Connections must not cross a fork
+        if getattr(local, 'pid', None) != os.getpid():
+            local.pid = os.getpid()
+            local.free = []
+        return local.free
+    
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA cache_size=-64000')
+        conn.execute('PRAGMA mmap_size=268435456')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        return conn
+    
+    def get(self) -> PooledConnection:
+        free = self._free_list()
+        conn = free.pop() if free else self._open()
+        conn.row_factory = sqlite3.Row
+        return PooledConnection(self, conn)
+    
+    def release(self, conn: sqlite3.Connection) -> None:
+        # Same semantics as close(): uncommitted work is discarded
+        if conn.in_transaction:
+            conn.rollback()
+        free = self._free_list()
+        if len(free) < self.max_idle:
+            # Undo per-session state a caller may have switched on, so the
+            # next checkout on this thread starts from the _open() defaults
+            conn.execute('PRAGMA foreign_keys=OFF')
+            free.append(conn)
+        else:
+            conn.close()
+
+
+_pool = ConnectionPool(DB_PATH)
+
+
+def get_db_connection() -> PooledConnection:
+    return _pool.get()
 
 def init_db() -> None:
     conn = get_db_connection()
@@ -34,7 +114,8 @@ def init_db() -> None:
             pages INTEGER,
             processed BOOLEAN DEFAULT 0,
             volume REAL,
-            chapter REAL
+            chapter REAL,
+            pages_index TEXT
         )
     ''')
     
@@ -370,6 +451,7 @@ def init_db() -> None:
             name TEXT NOT NULL,
             description TEXT,
             is_public BOOLEAN DEFAULT 0,
+            item_count INTEGER NOT NULL DEFAULT 0,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
@@ -619,6 +701,48 @@ def init_db() -> None:
         except sqlite3.OperationalError:
             pass
 
+    if current_version < 17:
+        # Migration 17: Persist the sorted archive page listing for each comic
+        try:
+            conn.execute('ALTER TABLE comics ADD COLUMN pages_index TEXT')
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+
+    if current_version < 18:
+        # Migration 18: Denormalized item count on user_lists
+        try:
+            conn.execute('ALTER TABLE user_lists ADD COLUMN item_count INTEGER NOT NULL DEFAULT 0')
+        except sqlite3.OperationalError:
+            pass  # Column already exists
+        conn.execute('''
+            UPDATE user_lists SET item_count = (
+                SELECT COUNT(*) FROM user_list_items WHERE list_id = user_lists.id
+            )
+        ''')
+
+    if current_version < 19:
+        # Migration 19: Composite indexes for series filtering and recent progress
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_series_cat_sub ON series(category, subcategory, name)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_rp_user_lastread ON reading_progress(user_id, last_read DESC)')
+        conn.execute('ANALYZE')
+
+    if current_version < 20:
+        # Migration 20: Series-name lookups and volume/chapter ordering on comics
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_comics_series_vol_ch ON comics(series, volume, chapter)')
+        conn.execute('ANALYZE')
+
+    # Triggers to keep user_lists.item_count in sync with user_list_items
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS user_list_items_ai AFTER INSERT ON user_list_items BEGIN
+            UPDATE user_lists SET item_count = item_count + 1 WHERE id = new.list_id;
+        END;
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS user_list_items_ad AFTER DELETE ON user_list_items BEGIN
+            UPDATE user_lists SET item_count = item_count - 1 WHERE id = old.list_id;
+        END;
+    ''')
+
     if current_version < SCHEMA_VERSION:
         conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
     
@@ -6,7 +6,7 @@ from typing import cast
 
 from logger import logger
 from .connection import get_db_connection
-from .series import extract_tags, normalize_tag
+from .series import extract_tags, normalize_tag, invalidate_series_list_cache
 from .settings import get_setting
 
 
@@ -125,6 +125,7 @@ def recompute_nsfw_flags(conn: sqlite3.Connection | None = None) -> None:
     if updates:
         _ = conn.executemany('UPDATE series SET is_nsfw = ? WHERE id = ?', updates)
         _ = conn.commit()
+        invalidate_series_list_cache()
 
     logger.info(f"Recomputed NSFW flags for {len(updates)} series ({flagged} flagged).")
 
@@ -1,4 +1,5 @@
-from typing import Optional, Dict, Any, List
+import time
+from typing import Optional, Dict, Any, List, Tuple, Iterator
 from .connection import get_db_connection
 
 # Reading progress functions
@@ -25,52 +26,67 @@ def get_reading_progress(user_id: int, comic_id: Optional[str] = None) -> Option
         conn.close()
         return {p['comic_id']: dict(p) for p in progress_list}
 
+def iter_reading_progress(user_id: int, batch_size: int = 500) -> Iterator[List[Dict[str, Any]]]:
+    """Yield all of a user's reading progress in batches.
+    
+    Each batch uses its own short-lived connection (keyset pagination on
+    comic_id), so the generator can be consumed from any thread.
+    """
+    last_comic_id = ''
+    while True:
+        conn = get_db_connection()
+        rows = conn.execute(
+            '''SELECT comic_id, current_page, total_pages, completed, last_read,
+                      reader_display, reader_direction, reader_zoom, seconds_read
+               FROM reading_progress WHERE user_id = ? AND comic_id > ?
+               ORDER BY comic_id LIMIT ?''',
+            (user_id, last_comic_id, batch_size)
+        ).fetchall()
+        conn.close()
+        if not rows:
+            return
+        yield [dict(r) for r in rows]
+        if len(rows) < batch_size:
+            return
+        last_comic_id = rows[-1]['comic_id']
+
+def get_recent_progress(user_id: int, limit: int = 12) -> List[Dict[str, Any]]:
+    """Get the user's most recently read progress entries, newest first"""
+    conn = get_db_connection()
+    progress_list = conn.execute(
+        '''SELECT comic_id, current_page, total_pages, completed, last_read,
+                  reader_display, reader_direction, reader_zoom, seconds_read
+           FROM reading_progress WHERE user_id = ? ORDER BY last_read DESC LIMIT ?''',
+        (user_id, limit)
+    ).fetchall()
+    conn.close()
+    return [dict(p) for p in progress_list]
+
 def update_reading_progress(user_id: int, comic_id: str, current_page: int, total_pages: Optional[int] = None, completed: Optional[bool] = None, 
                             reader_display: Optional[str] = None, reader_direction: Optional[str] = None, reader_zoom: Optional[str] = None, additional_seconds: int = 0) -> None:
-    """Update or insert reading progress"""
-    conn = get_db_connection()
-    
-    # Check if record exists
-    existing = conn.execute(
-        'SELECT id FROM reading_progress WHERE user_id = ? AND comic_id = ?',
-        (user_id, comic_id)
-    ).fetchone()
-    
-    if existing:
-        # Update
-        updates = ["current_page = ?", "last_read = CURRENT_TIMESTAMP", "seconds_read = seconds_read + ?"]
-        params: List[Any] = [current_page, additional_seconds]
-        
-        if total_pages is not None:
-            updates.append("total_pages = ?")
-            params.append(total_pages)
-        if completed is not None:
-            updates.append("completed = ?")
-            params.append(completed)
-        if reader_display is not None:
-            updates.append("reader_display = ?")
-            params.append(reader_display)
-        if reader_direction is not None:
-            updates.append("reader_direction = ?")
-            params.append(reader_direction)
-        if reader_zoom is not None:
-            updates.append("reader_zoom = ?")
-            params.append(reader_zoom)
-            
-        params.extend([user_id, comic_id])
-        sql = f"UPDATE reading_progress SET {', '.join(updates)} WHERE user_id = ? AND comic_id = ?"
-        conn.execute(sql, params)
-    else:
-        # Insert
-        conn.execute(
-            '''INSERT INTO reading_progress 
-               (user_id, comic_id, current_page, total_pages, completed, 
-                reader_display, reader_direction, reader_zoom, seconds_read)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-            (user_id, comic_id, current_page, total_pages or 0, completed or False,
-             reader_display, reader_direction, reader_zoom, additional_seconds)
-        )
+    """Update or insert reading progress in a single UPSERT.
     
+    Optional fields left as None keep their stored value on update.
+    """
+    conn = get_db_connection()
+    conn.execute(
+        '''INSERT INTO reading_progress 
+           (user_id, comic_id, current_page, total_pages, completed, 
+            reader_display, reader_direction, reader_zoom, seconds_read)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+           ON CONFLICT(user_id, comic_id) DO UPDATE SET
+               current_page = excluded.current_page,
+               last_read = CURRENT_TIMESTAMP,
+               seconds_read = seconds_read + excluded.seconds_read,
+               total_pages = COALESCE(?, total_pages),
+               completed = COALESCE(?, completed),
+               reader_display = COALESCE(excluded.reader_display, reader_display),
+               reader_direction = COALESCE(excluded.reader_direction, reader_direction),
+               reader_zoom = COALESCE(excluded.reader_zoom, reader_zoom)''',
+        (user_id, comic_id, current_page, total_pages or 0, completed or False,
+         reader_display, reader_direction, reader_zoom, additional_seconds,
+         total_pages, completed)
+    )
     conn.commit()
     conn.close()
 
@@ -130,15 +146,37 @@ def get_user_stats(user_id: int) -> Dict[str, Any]:
     }
 
 # User preferences functions
+# Preferences are read on nearly every page load but rarely written, so they
+# are kept per user for a few minutes and evicted on every write.
+_PREFS_CACHE: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+_PREFS_CACHE_TTL = 300
+_PREFS_CACHE_MAX = 10000
+
+def invalidate_user_preferences(user_id: int) -> None:
+    """Drop a user's cached preferences"""
+    _PREFS_CACHE.pop(user_id, None)
+
 def get_user_preferences(user_id: int) -> Optional[Dict[str, Any]]:
     """Get user preferences"""
+    cached = _PREFS_CACHE.get(user_id)
+    now = time.monotonic()
+    if cached and now - cached[0] < _PREFS_CACHE_TTL:
+        return dict(cached[1])
+    
     conn = get_db_connection()
     prefs = conn.execute(
         'SELECT * FROM user_preferences WHERE user_id = ?',
         (user_id,)
     ).fetchone()
     conn.close()
-    return dict(prefs) if prefs else None
+    if not prefs:
+        return None
+    
+    prefs_dict = dict(prefs)
+    if len(_PREFS_CACHE) >= _PREFS_CACHE_MAX:
+        _PREFS_CACHE.clear()
+    _PREFS_CACHE[user_id] = (now, prefs_dict)
+    return dict(prefs_dict)
 
 def update_user_preferences(user_id: int, **kwargs: Any) -> bool:
     """Update user preferences"""
@@ -163,6 +201,7 @@ def update_user_preferences(user_id: int, **kwargs: Any) -> bool:
     )
     conn.commit()
     conn.close()
+    invalidate_user_preferences(user_id)
     return True
 
 # Bookmark functions
@@ -187,20 +226,17 @@ def get_bookmarks(user_id: int, comic_id: Optional[str] = None) -> List[Dict[str
     return [dict(b) for b in bookmarks]
 
 def add_bookmark(user_id: int, comic_id: str, page_number: int, note: Optional[str] = None) -> bool:
-    """Add a bookmark"""
+    """Add a bookmark. Returns False if the page is already bookmarked."""
     conn = get_db_connection()
-    import sqlite3
-    try:
-        conn.execute(
-            'INSERT INTO bookmarks (user_id, comic_id, page_number, note) VALUES (?, ?, ?, ?)',
-            (user_id, comic_id, page_number, note)
-        )
-        conn.commit()
-        return True
-    except sqlite3.IntegrityError:
-        return False
-    finally:
-        conn.close()
+    cursor = conn.execute(
+        '''INSERT INTO bookmarks (user_id, comic_id, page_number, note) VALUES (?, ?, ?, ?)
+           ON CONFLICT(user_id, comic_id, page_number) DO NOTHING''',
+        (user_id, comic_id, page_number, note)
+    )
+    added = cursor.rowcount == 1
+    conn.commit()
+    conn.close()
+    return added
 
 def remove_bookmark(user_id: int, comic_id: str, page_number: int) -> None:
     """Remove a bookmark"""
@@ -3,7 +3,7 @@ import re
 import time
 import sqlite3
 import unicodedata
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Union
 from collections import defaultdict
 from .connection import get_db_connection
 from logger import logger
@@ -23,15 +23,11 @@ def resolve_norm(norm: str, modifications: Dict[str, Any]) -> str:
             break
     return norm
 
-def create_or_update_series(name: str, metadata: Optional[Dict[str, Any]] = None, category: Optional[str] = None, subcategory: Optional[str] = None, cover_comic_id: Optional[str] = None, conn: Optional[sqlite3.Connection] = None) -> int:
-    """Create or update a series with metadata from series.json"""
-    own_conn = conn is None
-    if own_conn:
-        conn = get_db_connection()
-    
+def _series_row(name: str, metadata: Optional[Dict[str, Any]], category: Optional[str], subcategory: Optional[str], cover_comic_id: Optional[str]) -> Tuple[Any, ...]:
+    """Build a series row (INSERT column order) from series.json metadata."""
     if metadata is None:
         metadata = {}
-    
+
     # Convert lists to JSON strings
     def to_json(val):
         if val is None:
@@ -39,10 +35,53 @@ def create_or_update_series(name: str, metadata: Optional[Dict[str, Any]] = None
         if isinstance(val, (list, tuple)):
             return json.dumps(val)
         return val
-    
+
+    return (
+        name,
+        metadata.get('title'),
+        metadata.get('title_english'),
+        to_json(metadata.get('title_japanese')),
+        to_json(metadata.get('synonyms')),
+        to_json(metadata.get('authors')),
+        metadata.get('synopsis'),
+        to_json(metadata.get('genres')),
+        to_json(metadata.get('tags')),
+        to_json(metadata.get('demographics')),
+        metadata.get('status'),
+        metadata.get('total_volumes'),
+        metadata.get('total_chapters'),
+        metadata.get('release_year'),
+        metadata.get('mal_id'),
+        metadata.get('anilist_id'),
+        cover_comic_id,
+        metadata.get('illumination') or metadata.get('image') or metadata.get('banner_image') or metadata.get('cover_image'),
+        metadata.get('cover_image'),
+        metadata.get('banner_image'),
+        category,
+        subcategory,
+        1 if metadata.get('is_adult') else 0
+    )
+
+_SERIES_INSERT_SQL = '''
+    INSERT INTO series (
+        name, title, title_english, title_japanese, synonyms, authors,
+        synopsis, genres, tags, demographics, status, total_volumes,
+        total_chapters, release_year, mal_id, anilist_id, cover_comic_id,
+        illumination, cover_image, banner_image, category, subcategory, is_adult
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+def create_or_update_series(name: str, metadata: Optional[Dict[str, Any]] = None, category: Optional[str] = None, subcategory: Optional[str] = None, cover_comic_id: Optional[str] = None, conn: Optional[sqlite3.Connection] = None) -> int:
+    """Create or update a series with metadata from series.json"""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db_connection()
+
+    row = _series_row(name, metadata, category, subcategory, cover_comic_id)
+
     # Check if series exists
     existing = conn.execute('SELECT id FROM series WHERE name = ?', (name,)).fetchone()
-    
+
     series_id: int
     if existing:
         # Update existing series
@@ -72,74 +111,69 @@ def create_or_update_series(name: str, metadata: Optional[Dict[str, Any]] = None
                 is_adult = ?,
                 updated_at = CURRENT_TIMESTAMP
             WHERE name = ?
-        ''', (
-            metadata.get('title'),
-            metadata.get('title_english'),
-            to_json(metadata.get('title_japanese')),
-            to_json(metadata.get('synonyms')),
-            to_json(metadata.get('authors')),
-            metadata.get('synopsis'),
-            to_json(metadata.get('genres')),
-            to_json(metadata.get('tags')),
-            to_json(metadata.get('demographics')),
-            metadata.get('status'),
-            metadata.get('total_volumes'),
-            metadata.get('total_chapters'),
-            metadata.get('release_year'),
-            metadata.get('mal_id'),
-            metadata.get('anilist_id'),
-            cover_comic_id,
-            metadata.get('illumination') or metadata.get('image') or metadata.get('banner_image') or metadata.get('cover_image'),
-            metadata.get('cover_image'),
-            metadata.get('banner_image'),
-            category,
-            subcategory,
-            1 if metadata.get('is_adult') else 0,
-            name
-        ))
+        ''', row[1:] + (name,))
         series_id = int(existing['id'])
     else:
         # Insert new series
-        cursor = conn.execute('''
-            INSERT INTO series (
-                name, title, title_english, title_japanese, synonyms, authors,
-                synopsis, genres, tags, demographics, status, total_volumes,
-                total_chapters, release_year, mal_id, anilist_id, cover_comic_id,
-                illumination, cover_image, banner_image, category, subcategory, is_adult
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            name,
-            metadata.get('title'),
-            metadata.get('title_english'),
-            to_json(metadata.get('title_japanese')),
-            to_json(metadata.get('synonyms')),
-            to_json(metadata.get('authors')),
-            metadata.get('synopsis'),
-            to_json(metadata.get('genres')),
-            to_json(metadata.get('tags')),
-            to_json(metadata.get('demographics')),
-            metadata.get('status'),
-            metadata.get('total_volumes'),
-            metadata.get('total_chapters'),
-            metadata.get('release_year'),
-            metadata.get('mal_id'),
-            metadata.get('anilist_id'),
-            cover_comic_id,
-            metadata.get('illumination') or metadata.get('image') or metadata.get('banner_image') or metadata.get('cover_image'),
-            metadata.get('cover_image'),
-            metadata.get('banner_image'),
-            category,
-            subcategory,
-            1 if metadata.get('is_adult') else 0
-        ))
+        cursor = conn.execute(_SERIES_INSERT_SQL, row)
         assert cursor.lastrowid is not None
         series_id = cursor.lastrowid
-    
+
+    invalidate_series_list_cache()
     if own_conn:
         conn.commit()
         conn.close()
     return series_id
 
+def upsert_series_batch(entries: List[Tuple[str, Optional[Dict[str, Any]], Optional[str], Optional[str], Optional[str]]], conn: sqlite3.Connection) -> Dict[str, int]:
+    """Create or update many series at once and return a {name: id} map.
+
+    Entries are (name, metadata, category, subcategory, cover_comic_id), merged
+    with the same rules as create_or_update_series. The caller commits.
+    """
+    if not entries:
+        return {}
+
+    conn.executemany(_SERIES_INSERT_SQL + '''
+        ON CONFLICT(name) DO UPDATE SET
+            title = COALESCE(excluded.title, title),
+            title_english = COALESCE(excluded.title_english, title_english),
+            title_japanese = COALESCE(excluded.title_japanese, title_japanese),
+            synonyms = COALESCE(excluded.synonyms, synonyms),
+            authors = COALESCE(excluded.authors, authors),
+            synopsis = COALESCE(excluded.synopsis, synopsis),
+            genres = COALESCE(excluded.genres, genres),
+            tags = COALESCE(excluded.tags, tags),
+            demographics = COALESCE(excluded.demographics, demographics),
+            status = COALESCE(excluded.status, status),
+            total_volumes = COALESCE(excluded.total_volumes, total_volumes),
+            total_chapters = COALESCE(excluded.total_chapters, total_chapters),
+            release_year = COALESCE(excluded.release_year, release_year),
+            mal_id = COALESCE(excluded.mal_id, mal_id),
+            anilist_id = COALESCE(excluded.anilist_id, anilist_id),
+            cover_comic_id = COALESCE(excluded.cover_comic_id, cover_comic_id),
+            illumination = COALESCE(excluded.illumination, illumination),
+            cover_image = COALESCE(excluded.cover_image, cover_image),
+            banner_image = COALESCE(excluded.banner_image, banner_image),
+            category = COALESCE(excluded.category, category),
+            subcategory = COALESCE(excluded.subcategory, subcategory),
+            is_adult = excluded.is_adult,
+            updated_at = CURRENT_TIMESTAMP
+    ''', [_series_row(*entry) for entry in entries])
+
+    names = [entry[0] for entry in entries]
+    series_ids: Dict[str, int] = {}
+    # Chunked to stay under SQLite's bound-parameter limit
+    for i in range(0, len(names), 500):
+        chunk = names[i:i + 500]
+        placeholders = ','.join('?' * len(chunk))
+        series_ids.update(conn.execute(
+            f'SELECT name, id FROM series WHERE name IN ({placeholders})', chunk
+        ).fetchall())
+
+    invalidate_series_list_cache()
+    return series_ids
+
 def get_series_by_name(name: str) -> Optional[Dict[str, Any]]:
     """Get series by name"""
     conn = get_db_connection()
@@ -148,7 +182,11 @@ def get_series_by_name(name: str) -> Optional[Dict[str, Any]]:
     return dict(series) if series else None
 
 def get_series_with_comics(name: str, user_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
-    """Get series with all its comics, optionally including user progress"""
+    """Get series with all its comics, optionally including user progress.
+    
+    When user_id is given, each comic carries its user_progress and the
+    series gets aggregate reading 'stats' computed in SQL.
+    """
     conn = get_db_connection()
     
     # Get series info
@@ -181,36 +219,61 @@ def get_series_with_comics(name: str, user_id: Optional[int] = None) -> Optional
     
     # Get all comics for this series
     if series_dict.get('id'):
-        comics = conn.execute('''
-            SELECT c.* FROM comics c
-            WHERE c.series_id = ?
-            ORDER BY 
-                CASE WHEN c.volume IS NULL OR c.volume = 0 THEN 999999 ELSE c.volume END,
-                COALESCE(c.chapter, 0), 
-                c.filename
-        ''', (series_dict['id'],)).fetchall()
+        where, key = 'c.series_id = ?', series_dict['id']
     else:
         # Fallback: match by series name
-        comics = conn.execute('''
-            SELECT * FROM comics
-            WHERE series = ?
-            ORDER BY 
-                CASE WHEN volume IS NULL OR volume = 0 THEN 999999 ELSE volume END,
-                COALESCE(chapter, 0), 
-                filename
-        ''', (name,)).fetchall()
+        where, key = 'c.series = ?', name
+    
+    order = '''
+        ORDER BY 
+            CASE WHEN c.volume IS NULL OR c.volume = 0 THEN 999999 ELSE c.volume END,
+            COALESCE(c.chapter, 0), 
+            c.filename
+    '''
+    
+    if user_id:
+        # Progress comes back in the same query instead of one lookup per comic
+        comics = conn.execute(f'''
+            SELECT c.*, rp.comic_id AS rp_comic_id, rp.current_page AS rp_current_page,
+                   rp.completed AS rp_completed
+            FROM comics c
+            LEFT JOIN reading_progress rp ON rp.comic_id = c.id AND rp.user_id = ?
+            WHERE {where}
+            {order}
+        ''', (user_id, key)).fetchall()
+    else:
+        comics = conn.execute(f'SELECT c.* FROM comics c WHERE {where} {order}', (key,)).fetchall()
     
     series_dict['comics'] = [dict(c) for c in comics]
+    for comic in series_dict['comics']:
+        comic.pop('pages_index', None)
+        if user_id:
+            has_progress = comic.pop('rp_comic_id') is not None
+            current_page = comic.pop('rp_current_page')
+            completed = comic.pop('rp_completed')
+            if has_progress:
+                comic['user_progress'] = {'current_page': current_page, 'completed': completed}
     
-    # Add user progress if requested
-    if user_id and series_dict['comics']:
-        for comic in series_dict['comics']:
-            progress = conn.execute('''
-                SELECT current_page, completed FROM reading_progress
-                WHERE user_id = ? AND comic_id = ?
-            ''', (user_id, comic['id'])).fetchone()
-            if progress:
-                comic['user_progress'] = dict(progress)
+    if user_id:
+        stats = conn.execute(f'''
+            SELECT COUNT(*),
+                   COALESCE(SUM(c.pages), 0),
+                   COALESCE(SUM(rp.current_page), 0),
+                   COUNT(CASE WHEN rp.completed THEN 1 END),
+                   COUNT(CASE WHEN NOT COALESCE(rp.completed, 0) AND rp.current_page > 0 THEN 1 END)
+            FROM comics c
+            LEFT JOIN reading_progress rp ON rp.comic_id = c.id AND rp.user_id = ?
+            WHERE {where}
+        ''', (user_id, key)).fetchone()
+        total_comics, total_pages, read_pages, completed_count, in_progress_count = stats
+        series_dict['stats'] = {
+            'total_comics': total_comics,
+            'total_pages': total_pages,
+            'completed_comics': completed_count,
+            'in_progress_comics': in_progress_count,
+            'read_pages': read_pages,
+            'progress_percentage': (read_pages / total_pages * 100) if total_pages > 0 else 0
+        }
     
     conn.close()
     return series_dict
@@ -252,36 +315,82 @@ def rename_or_merge_series(series_id: int, new_name: str, conn: Optional[sqlite3
             series_id = target_id
             logger.info(f"Merged series {series_id} into {target_id} due to name conflict: {new_name}")
             if own_conn: conn.commit()
-            
+    
+    invalidate_series_list_cache()
     if own_conn:
         conn.close()
     return series_id
 
-def get_all_series(category: Optional[str] = None, subcategory: Optional[str] = None, limit: int = 100, offset: int = 0, nsfw_mode: str = 'off') -> List[Dict[str, Any]]:
-    """Get all series with optional filtering"""
+# --- Short-lived cache for series listing pages ---
+# Keyed by the get_all_series arguments; entries expire after the TTL and the
+# whole cache is dropped whenever series rows are written.
+_SERIES_LIST_CACHE: Dict[tuple, Tuple[float, Any]] = {}
+_SERIES_LIST_CACHE_TTL = 60
+_SERIES_LIST_CACHE_MAX = 256
+
+def invalidate_series_list_cache() -> None:
+    """Drop cached series listing pages after series rows change"""
+    _SERIES_LIST_CACHE.clear()
+
+def get_all_series(category: Optional[str] = None, subcategory: Optional[str] = None, limit: int = 100, offset: int = 0, nsfw_mode: str = 'off', with_total: bool = False) -> Union[List[Dict[str, Any]], Tuple[List[Dict[str, Any]], int]]:
+    """Get all series with optional filtering.
+    
+    With with_total=True, returns (series_list, total) where total is the
+    unpaginated match count, computed in the same query via a window function.
+    """
+    key = (category, subcategory, limit, offset, nsfw_mode, with_total)
+    cached = _SERIES_LIST_CACHE.get(key)
+    now = time.monotonic()
+    if cached and now - cached[0] < _SERIES_LIST_CACHE_TTL:
+        return _copy_series_result(cached[1])
+    
+    result = _query_all_series(category, subcategory, limit, offset, nsfw_mode, with_total)
+    
+    if len(_SERIES_LIST_CACHE) >= _SERIES_LIST_CACHE_MAX:
+        _SERIES_LIST_CACHE.clear()
+    _SERIES_LIST_CACHE[key] = (now, result)
+    return _copy_series_result(result)
+
+def _copy_series_result(result: Union[List[Dict[str, Any]], Tuple[List[Dict[str, Any]], int]]) -> Union[List[Dict[str, Any]], Tuple[List[Dict[str, Any]], int]]:
+    """Hand callers their own dicts so mutating a result can't alter the cache."""
+    if isinstance(result, tuple):
+        series_list, total = result
+        return [dict(s) for s in series_list], total
+    return [dict(s) for s in result]
+
+def _query_all_series(category: Optional[str], subcategory: Optional[str], limit: int, offset: int, nsfw_mode: str, with_total: bool) -> Union[List[Dict[str, Any]], Tuple[List[Dict[str, Any]], int]]:
     conn = get_db_connection()
     
-    query = 'SELECT * FROM series WHERE 1=1'
-    params = []
+    where = ' WHERE 1=1'
+    params: List[Any] = []
     
     if category:
-        query += ' AND category = ?'
+        where += ' AND category = ?'
         params.append(category)
     if subcategory:
-        query += ' AND subcategory = ?'
+        where += ' AND subcategory = ?'
         params.append(subcategory)
     if nsfw_mode == 'filter':
-        query += ' AND is_nsfw = 0'
+        where += ' AND is_nsfw = 0'
+    
+    total_select = ', COUNT(*) OVER () AS _total' if with_total else ''
+    query = f'SELECT *{total_select} FROM series{where} ORDER BY name LIMIT ? OFFSET ?'
     
-    query += ' ORDER BY name LIMIT ? OFFSET ?'
-    params.extend([limit, offset])
+    series_list = conn.execute(query, params + [limit, offset]).fetchall()
     
-    series_list = conn.execute(query, params).fetchall()
+    total = 0
+    if with_total:
+        if series_list:
+            total = series_list[0]['_total']
+        elif offset > 0:
+            # Paged past the end: the window has no rows to report on
+            total = conn.execute(f'SELECT COUNT(*) FROM series{where}', params).fetchone()[0]
     conn.close()
     
     result = []
     for series in series_list:
         s = dict(series)
+        s.pop('_total', None)
         for field in ['synonyms', 'authors', 'genres', 'tags', 'demographics', 'title_japanese']:
             if s.get(field):
                 try:
@@ -290,6 +399,8 @@ def get_all_series(category: Optional[str] = None, subcategory: Optional[str] =
                     pass
         result.append(s)
     
+    if with_total:
+        return result, total
     return result
 
 def sanitize_tag(t: str) -> str:
@@ -411,6 +522,7 @@ _TAG_CACHE = {
     'containment_map': None,
     'tag_lookup': None,
     'modifications': {}, # Map source_norm -> {action, target_norm, display_name}
+    'statuses': [],
     'last_updated': 0
 }
 
@@ -430,9 +542,10 @@ def _refresh_tag_cache(conn: Optional[sqlite3.Connection] = None) -> None:
     mod_rows = conn.execute("SELECT source_norm, action, target_norm, display_name FROM tag_modifications").fetchall()
     modifications = {row['source_norm']: dict(row) for row in mod_rows}
     
-    rows = conn.execute("SELECT genres, tags, demographics FROM series").fetchall()
+    rows = conn.execute("SELECT genres, tags, demographics, status FROM series").fetchall()
     
     system_tags = {}
+    statuses = {row['status'] for row in rows if row['status'] is not None}
     
     # 1. Add whitelist/renamed tags first
     for norm, mod in modifications.items():
@@ -513,6 +626,7 @@ def _refresh_tag_cache(conn: Optional[sqlite3.Connection] = None) -> None:
     _TAG_CACHE['containment_map'] = containment_map
     _TAG_CACHE['tag_lookup'] = tag_lookup
     _TAG_CACHE['modifications'] = modifications
+    _TAG_CACHE['statuses'] = sorted(statuses)
     _TAG_CACHE['last_updated'] = time.time()
     
     if close_conn:
@@ -708,6 +822,7 @@ def invalidate_tag_cache() -> None:
     _TAG_CACHE['containment_map'] = None
     _TAG_CACHE['tag_lookup'] = None
     _TAG_CACHE['last_updated'] = 0
+    invalidate_series_list_cache()
 
 def warm_up_metadata_cache() -> None:
     """Warm up the tag and search caches on server boot or manual reload"""
@@ -905,18 +1020,12 @@ def get_user_rating(user_id: int, series_id: int) -> Optional[int]:
 
 def get_series_metadata() -> Dict[str, List[str]]:
     """Get unique genres, tags, and statuses for filtering"""
-    conn = get_db_connection()
-    
-    # Get unique statuses
-    statuses = [row[0] for row in conn.execute("SELECT DISTINCT status FROM series WHERE status IS NOT NULL").fetchall()]
-    
-    # Get unique genres and tags from cache
-    _refresh_tag_cache(conn)
+    # Statuses, genres and tags all come from the tag cache
+    _refresh_tag_cache()
     genres = sorted(list(_TAG_CACHE['system_tags'].values()))
     
-    conn.close()
     return {
-        "statuses": sorted(statuses),
+        "statuses": list(_TAG_CACHE['statuses']),
         "genres": genres
     }
 
@@ -4,6 +4,7 @@ import bcrypt
 import sqlite3
 from typing import Optional, Dict, Any, List
 from .connection import get_db_connection
+from .progress import invalidate_user_preferences
 
 def create_user(username: str, password: str, email: Optional[str] = None, role: str = 'reader', must_change_password: bool = False) -> Optional[int]:
     """Create a new user with hashed password"""
@@ -128,6 +129,7 @@ def delete_user(user_id: int) -> None:
     conn.execute('DELETE FROM users WHERE id = ?', (user_id,))
     conn.commit()
     conn.close()
+    invalidate_user_preferences(user_id)
 
 def update_user_role(user_id: int, role: str) -> bool:
     """Update a user's role (admin only)"""
@@ -5,7 +5,7 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-async def get_current_user(token: Optional[str] = Cookie(None, alias="session_token")) -> Dict[str, Any]:
+def get_current_user(token: Optional[str] = Cookie(None, alias="session_token")) -> Dict[str, Any]:
     """Dependency to get current authenticated user"""
     if not token:
         logger.warning("Auth failed: No session token")
@@ -35,7 +35,7 @@ async def get_admin_user(current_user: Dict[str, Any] = Depends(get_current_user
         raise HTTPException(status_code=403, detail="Admin access required")
     return current_user
 
-async def get_optional_user(token: Optional[str] = Cookie(None, alias="session_token")) -> Optional[Dict[str, Any]]:
+def get_optional_user(token: Optional[str] = Cookie(None, alias="session_token")) -> Optional[Dict[str, Any]]:
     """Dependency to get user if logged in, but not require it"""
     if not token:
         return None
@@ -9,6 +9,7 @@ from database import get_all_users, delete_user, update_user_role, update_user_p
 from dependencies import get_admin_user
 from db.settings import get_all_settings, set_setting, get_setting
 from db.connection import get_db_connection
+from db.series import invalidate_series_list_cache
 from scanner import fast_scan_library_task, rescan_library_task, thumbnail_rescan_task, metadata_rescan_task
 from config import COMICS_DIR
 import httpx
@@ -477,6 +478,8 @@ async def set_nsfw_override(
     finally:
         conn.close()
 
+    invalidate_series_list_cache()
+
     label = {None: 'auto', 1: 'NSFW', 0: 'safe'}[request.override]
     return {'updated': len(request.series_ids), 'override': label}
 
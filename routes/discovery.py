@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends
 from typing import Dict, Any, List
+import heapq
 from collections import defaultdict
 from datetime import datetime, timedelta
 from dependencies import get_current_user
@@ -228,10 +229,9 @@ async def get_suggestions(
                 'matching_tags': list(matches)
             })
     
-    # Sort by score and return top 30
-    scored.sort(key=lambda x: x['score'], reverse=True)
+    # Top 30 by score without sorting every candidate
     result = []
-    for item in scored[:30]:
+    for item in heapq.nlargest(30, scored, key=lambda x: x['score']):
         data = item['data']
         entry = {
             'id': data['id'],
@@ -1,5 +1,6 @@
 import os
 import re
+import json
 import zipfile
 import rarfile
 import threading
@@ -13,19 +14,22 @@ from concurrent.futures import ThreadPoolExecutor
 # Explicitly register JXL if not present
 if not mimetypes.types_map.get('.jxl'):
     mimetypes.add_type('image/jxl', '.jxl')
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Response, Query
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Request, Response, Query
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
-from PIL import Image, ImageDraw, ImageFont
-from config import COMICS_DIR, IMG_EXTENSIONS, get_thumbnail_path, BASE_CACHE_DIR
-from database import get_db_connection, get_reading_progress
-from scanner import natural_sort_key, extract_cover_image
+from typing import Optional, List, Dict, Any, Tuple
+from config import COMICS_DIR, get_thumbnail_path, BASE_CACHE_DIR
+from database import get_db_connection
+from scanner import natural_sort_key, image_members, sorted_image_names, extract_cover_image, read_cbr_member, read_cbr_members
 from dependencies import get_current_user, get_admin_user
 from logger import logger
 
 router = APIRouter(prefix="/api", tags=["library"])
 
+# Placeholder served while a cover is still being generated (never cached by the browser)
+_PLACEHOLDER_PATH = os.path.join(BASE_CACHE_DIR, "_placeholder.webp")
+_PLACEHOLDER_HEADERS = {"Cache-Control": "no-store"}
+
 # Global state for export progress
 export_jobs = {}
 
@@ -81,9 +85,12 @@ cleanup_orphaned_exports()
 
 def create_placeholder_image() -> str:
     """Create a 'Generating...' placeholder image if it doesn't exist"""
-    placeholder_path = os.path.join(BASE_CACHE_DIR, "_placeholder.webp")
+    placeholder_path = _PLACEHOLDER_PATH
     if not os.path.exists(placeholder_path):
         try:
+            # Pillow is only needed the first time the placeholder is rendered
+            from PIL import Image, ImageDraw, ImageFont
+            
             # Create a simple gray placeholder image
             img = Image.new('RGB', (300, 450), (128, 128, 128))  # type: ignore[arg-type]
             draw = ImageDraw.Draw(img)
@@ -200,6 +207,15 @@ async def search(q: str, current_user: Dict[str, Any] = Depends(get_current_user
     nsfw_mode = current_user.get('nsfw_mode', 'off')
     return search_series(q, nsfw_mode=nsfw_mode)
 
+# Columns returned by /api/books (pages_index is deliberately left out)
+_BOOK_COMIC_COLUMNS = (
+    'id', 'path', 'title', 'series', 'category', 'filename', 'size_str', 'size_bytes',
+    'mtime', 'pages', 'processed', 'volume', 'chapter', 'series_id', 'has_thumbnail',
+    'file_hash', 'library_id', 'thumbnail_ext'
+)
+_BOOK_KEYS = _BOOK_COMIC_COLUMNS + ('genres', 'series_status', 'tags', 'authors')
+_BOOK_SELECT = ', '.join(f'c.{col}' for col in _BOOK_COMIC_COLUMNS) + ', s.genres, s.status, s.tags, s.authors'
+
 @router.get("/books")
 async def list_books(
     limit: int = Query(100, description="Number of items to return (0 = all)"),
@@ -229,37 +245,42 @@ async def list_books(
         nsfw_where = ''
 
     total = conn.execute(count_query).fetchone()['total']
+    
+    # Rows are fetched as plain tuples and zipped against a fixed key tuple,
+    # skipping the intermediate sqlite3.Row object per book
+    keys = _BOOK_KEYS + (('is_nsfw',) if nsfw_select else ())
+    cursor = conn.cursor()
+    cursor.row_factory = None
 
     if limit == 0:
         query = f'''
-            SELECT c.*, s.genres, s.status as series_status, s.tags, s.authors{nsfw_select}
+            SELECT {_BOOK_SELECT}{nsfw_select}
             FROM comics c
             LEFT JOIN series s ON c.series_id = s.id
             {nsfw_where}
             ORDER BY c.category, c.series, c.volume, c.chapter, c.filename
         '''
-        books = conn.execute(query).fetchall()
+        books = cursor.execute(query).fetchall()
         limit = total
     else:
         limit = max(1, min(limit, 500))
         query = f'''
-            SELECT c.*, s.genres, s.status as series_status, s.tags, s.authors{nsfw_select}
+            SELECT {_BOOK_SELECT}{nsfw_select}
             FROM comics c
             LEFT JOIN series s ON c.series_id = s.id
             {nsfw_where}
             ORDER BY c.category, c.series, c.volume, c.chapter, c.filename
             LIMIT ? OFFSET ?
         '''
-        books = conn.execute(query, (limit, offset)).fetchall()
+        books = cursor.execute(query, (limit, offset)).fetchall()
     conn.close()
     
     result = []
-    import json
     for row in books:
-        d = dict(row)
+        d = dict(zip(keys, row))
         # Parse JSON fields if present
-        for field in ['genres', 'tags', 'authors']:
-            if d.get(field):
+        for field in ('genres', 'tags', 'authors'):
+            if d[field]:
                 try:
                     d[field] = json.loads(d[field])
                 except:
@@ -276,12 +297,24 @@ async def list_books(
         "has_more": (offset + limit) < total
     }
 
+def _cached_file_response(path: Optional[str]) -> Optional[FileResponse]:
+    """Return a FileResponse for path if it exists, reusing a single stat for existence and headers"""
+    if not path:
+        return None
+    try:
+        stat_result = os.stat(path)
+    except FileNotFoundError:
+        return None
+    # Passing stat_result lets Starlette skip its own stat and derive ETag/Last-Modified from ours
+    return FileResponse(path, stat_result=stat_result)
+
 @router.get("/cover/{comic_id}")
 async def get_cover(comic_id: str, current_user: Dict[str, Any] = Depends(get_current_user)) -> Response:
     # 1. Optimistic check for WebP (most common)
-    cache_path = get_thumbnail_path(comic_id, 'webp')
-    if cache_path and os.path.exists(cache_path):
-        return FileResponse(cache_path)
+    webp_path = get_thumbnail_path(comic_id, 'webp')
+    cached = _cached_file_response(webp_path)
+    if cached:
+        return cached
     
     # 2. Check DB for extension and path
     conn = get_db_connection()
@@ -293,16 +326,16 @@ async def get_cover(comic_id: str, current_user: Dict[str, Any] = Depends(get_cu
         
     ext = comic['thumbnail_ext']
     if ext and ext != 'webp': # We already checked webp
-        cache_path = get_thumbnail_path(comic_id, ext)
-        if cache_path and os.path.exists(cache_path):
-            return FileResponse(cache_path)
+        cached = _cached_file_response(get_thumbnail_path(comic_id, ext))
+        if cached:
+            return cached
             
     # 3. Fallback check for other extensions (migration support or manual changes)
     if not ext:
         for check_ext in ['jpg', 'png', 'jpeg']:
-            alt_path = get_thumbnail_path(comic_id, check_ext)
-            if alt_path and os.path.exists(alt_path):
-                return FileResponse(alt_path)
+            cached = _cached_file_response(get_thumbnail_path(comic_id, check_ext))
+            if cached:
+                return cached
     
     comic_path = comic['path']
     
@@ -315,8 +348,7 @@ async def get_cover(comic_id: str, current_user: Dict[str, Any] = Depends(get_cu
     
     if result['timeout']:
         # Timeout occurred - return placeholder and continue generation in background
-        placeholder_path = os.path.join(BASE_CACHE_DIR, "_placeholder.webp")
-        return FileResponse(placeholder_path)
+        return FileResponse(_PLACEHOLDER_PATH, headers=_PLACEHOLDER_HEADERS)
     
     if result['success']:
         # Update has_thumbnail flag in database
@@ -329,27 +361,49 @@ async def get_cover(comic_id: str, current_user: Dict[str, Any] = Depends(get_cu
         # Serve the newly generated thumbnail
         # If we update generate_thumbnail_with_timeout to use settings later, we need to know what it produced.
         # For now, it produces result['cache_path']
-        final_cache_path = result.get('cache_path')
-        if not final_cache_path:
-             final_cache_path = get_thumbnail_path(comic_id, 'webp')
+        final_cache_path = result.get('cache_path') or webp_path
              
-        if final_cache_path and os.path.exists(final_cache_path):
-            return FileResponse(final_cache_path)
+        cached = _cached_file_response(final_cache_path)
+        if cached:
+            return cached
     
     # Generation failed - return 404
     return Response(status_code=404)
 
+# reading_progress columns returned to the reader as user_progress
+_READER_PROGRESS_FIELDS = (
+    'current_page', 'total_pages', 'completed', 'last_read',
+    'reader_display', 'reader_direction', 'reader_zoom', 'seconds_read'
+)
+_READER_PROGRESS_SELECT = ', '.join(f'rp.{field} AS rp_{field}' for field in _READER_PROGRESS_FIELDS)
+
 @router.get("/read/{comic_id}")
 async def read_comic(comic_id: str, current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
     """Returns metadata for the reader, including user's progress if logged in"""
     conn = get_db_connection()
-    book = conn.execute("SELECT * FROM comics WHERE id = ?", (comic_id,)).fetchone()
+    if current_user:
+        # Fetch the user's progress in the same round-trip as the comic row
+        book = conn.execute(f'''
+            SELECT c.*, rp.id AS rp_id, {_READER_PROGRESS_SELECT}
+            FROM comics c
+            LEFT JOIN reading_progress rp ON rp.comic_id = c.id AND rp.user_id = ?
+            WHERE c.id = ?
+        ''', (current_user['id'], comic_id)).fetchone()
+    else:
+        book = conn.execute("SELECT * FROM comics WHERE id = ?", (comic_id,)).fetchone()
     
     if not book:
         conn.close()
         raise HTTPException(status_code=404, detail="Book not found")
     
     result = dict(book)
+    result.pop('pages_index', None)
+    
+    # Split the joined progress columns out into user_progress
+    has_progress = result.pop('rp_id', None) is not None
+    progress = {field: result.pop(f'rp_{field}', None) for field in _READER_PROGRESS_FIELDS}
+    if has_progress:
+        result['user_progress'] = {'comic_id': comic_id, **progress}
     
     # On-demand page counting if missing
     if result.get('pages') is None or result.get('pages') == 0:
@@ -358,10 +412,10 @@ async def read_comic(comic_id: str, current_user: Dict[str, Any] = Depends(get_c
             pages = 0
             if filepath.lower().endswith('.cbz'):
                 with zipfile.ZipFile(filepath, 'r') as z:
-                    pages = len([n for n in z.namelist() if n.lower().endswith(IMG_EXTENSIONS)])
+                    pages = len(image_members(z))
             elif filepath.lower().endswith('.cbr'):
                 with rarfile.RarFile(filepath) as r:
-                    pages = len([n for n in r.namelist() if n.lower().endswith(IMG_EXTENSIONS)])
+                    pages = len(image_members(r))
             
             if pages > 0:
                 conn.execute("UPDATE comics SET pages = ? WHERE id = ?", (pages, comic_id))
@@ -371,19 +425,13 @@ async def read_comic(comic_id: str, current_user: Dict[str, Any] = Depends(get_c
         except Exception as e:
             logger.error(f"Error lazy-counting pages for {comic_id}: {e}")
     
-    # Add user's reading progress if logged in
-    if current_user:
-        progress = get_reading_progress(current_user['id'], comic_id)
-        if progress:
-            result['user_progress'] = progress
-    
     conn.close()
     return result
 
 @router.get("/read/{comic_id}/page/{page_num}")
-async def get_comic_page(comic_id: str, page_num: int, current_user: Dict[str, Any] = Depends(get_current_user)) -> Response:
+async def get_comic_page(comic_id: str, page_num: int, request: Request, current_user: Dict[str, Any] = Depends(get_current_user)) -> Response:
     conn = get_db_connection()
-    book = conn.execute("SELECT path FROM comics WHERE id = ?", (comic_id,)).fetchone()
+    book = conn.execute("SELECT path, pages_index FROM comics WHERE id = ?", (comic_id,)).fetchone()
     conn.close()
     
     if not book:
@@ -395,30 +443,99 @@ async def get_comic_page(comic_id: str, page_num: int, current_user: Dict[str, A
         images: List[str] = []
         file_ext = os.path.splitext(filepath)[1].lower()
         
+        # Sorted page listing persisted by the scanner; avoids re-reading the archive directory
+        if book['pages_index']:
+            try:
+                images = json.loads(book['pages_index'])
+            except (json.JSONDecodeError, TypeError):
+                images = []
+        
         if file_ext == '.cbz':
             with zipfile.ZipFile(filepath, 'r') as z:
-                images = sorted([n for n in z.namelist() if n.lower().endswith(IMG_EXTENSIONS)], key=natural_sort_key)
+                if not images:
+                    images = sorted_image_names(z)
+                    _store_pages_index(comic_id, images)
                 if 0 <= page_num < len(images):
                     with z.open(images[page_num]) as f:
                         image_data = f.read()
         elif file_ext == '.cbr':
-            with rarfile.RarFile(filepath) as r:
-                images = sorted([n for n in r.namelist() if n.lower().endswith(IMG_EXTENSIONS)], key=natural_sort_key)
-                if 0 <= page_num < len(images):
-                    with r.open(images[page_num]) as f:
-                        image_data = f.read()
+            if not images:
+                with rarfile.RarFile(filepath) as r:
+                    images = sorted_image_names(r)
+                _store_pages_index(comic_id, images)
+            if 0 <= page_num < len(images):
+                image_data = read_cbr_member(filepath, images[page_num])
         
         if image_data and images:
             # Guess media type from the original filename in the archive
             img_filename = images[page_num]
             content_type, _ = mimetypes.guess_type(img_filename)
-            return Response(content=image_data, media_type=content_type or "image/jpeg")
+            media_type = content_type or "image/jpeg"
+            total = len(image_data)
+            
+            range_header = request.headers.get('range')
+            if range_header:
+                byte_range = _parse_byte_range(range_header, total)
+                if byte_range is None:
+                    return Response(status_code=416, headers={"Content-Range": f"bytes */{total}"})
+                start, end = byte_range
+                return Response(
+                    content=image_data[start:end + 1],
+                    status_code=206,
+                    media_type=media_type,
+                    headers={
+                        "Content-Range": f"bytes {start}-{end}/{total}",
+                        "Accept-Ranges": "bytes",
+                        "Content-Length": str(end - start + 1)
+                    }
+                )
+            
+            return Response(
+                content=image_data,
+                media_type=media_type,
+                headers={"Accept-Ranges": "bytes", "Content-Length": str(total)}
+            )
         else:
             raise HTTPException(status_code=404, detail="Page not found")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error reading page {page_num} of {filepath}: {e}")
         raise HTTPException(status_code=500, detail="Error reading comic archive")
 
+def _parse_byte_range(range_header: str, total: int) -> Optional[Tuple[int, int]]:
+    """Parse a single 'bytes=start-end' Range header. Returns inclusive (start, end) or None if unsatisfiable."""
+    unit, _, spec = range_header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec or total == 0:
+        return None
+    start_str, _, end_str = spec.strip().partition('-')
+    try:
+        if start_str == '':
+            # Suffix range: last N bytes
+            length = int(end_str)
+            if length <= 0:
+                return None
+            return max(0, total - length), total - 1
+        start = int(start_str)
+        end = int(end_str) if end_str else total - 1
+    except ValueError:
+        return None
+    if start >= total or end < start:
+        return None
+    return start, min(end, total - 1)
+
+def _store_pages_index(comic_id: str, images: List[str]) -> None:
+    """Backfill the persisted page listing for comics scanned before pages_index existed"""
+    if not images:
+        return
+    try:
+        conn = get_db_connection()
+        conn.execute("UPDATE comics SET pages_index = ? WHERE id = ?", (json.dumps(images), comic_id))
+        conn.commit()
+        conn.close()
+    except Exception as e:
+        logger.warning(f"Could not store page index for {comic_id}: {e}")
+
 class ExportCBZRequest(BaseModel):
     comic_ids: List[str]
     filename: Optional[str] = "export.cbz"
@@ -504,20 +621,17 @@ def create_export_task(job_id: str, comic_ids: List[str], export_filename: str)
                     file_ext = os.path.splitext(filepath)[1].lower()
                     if file_ext == '.cbz':
                         with zipfile.ZipFile(filepath, 'r') as in_zip:
-                            img_names = [n for n in in_zip.namelist() if n.lower().endswith(IMG_EXTENSIONS)]
-                            for img_name in img_names:
+                            for img_name in image_members(in_zip):
                                 with in_zip.open(img_name) as f_in:
                                     target_name = f"{folder_prefix}{os.path.basename(img_name)}"
                                     with out_zip.open(target_name, 'w') as f_out:
                                         shutil.copyfileobj(f_in, f_out)
                     elif file_ext == '.cbr':
                         with rarfile.RarFile(filepath) as in_rar:
-                            img_names = [n for n in in_rar.namelist() if n.lower().endswith(IMG_EXTENSIONS)]
-                            for img_name in img_names:
-                                with in_rar.open(img_name) as f_in:
-                                    target_name = f"{folder_prefix}{os.path.basename(img_name)}"
-                                    with out_zip.open(target_name, 'w') as f_out:
-                                        shutil.copyfileobj(f_in, f_out)
+                            img_names = image_members(in_rar)
+                        for img_name, data in read_cbr_members(filepath, img_names):
+                            target_name = f"{folder_prefix}{os.path.basename(img_name)}"
+                            out_zip.writestr(target_name, data)
                 except Exception as e:
                     logger.error(f"Error adding {filepath} to export: {e}")
                 
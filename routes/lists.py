@@ -59,16 +59,7 @@ async def get_lists(
     total = len(all_lists)
     items = all_lists[offset:offset + limit]
     
-    # Add item count to each list
-    for lst in items:
-        conn = get_db_connection()
-        count = conn.execute(
-            'SELECT COUNT(*) as cnt FROM user_list_items WHERE list_id = ?',
-            (lst['id'],)
-        ).fetchone()['cnt']
-        conn.close()
-        lst['item_count'] = count
-    
+    # item_count is maintained on user_lists by triggers
     return {
         "items": items,
         "total": total,
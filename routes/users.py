@@ -1,11 +1,16 @@
+import json
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterator
 from database import (
-    get_reading_progress, update_reading_progress,
+    get_reading_progress, get_recent_progress as db_get_recent_progress,
+    iter_reading_progress,
+    update_reading_progress,
     get_user_preferences, update_user_preferences,
     get_bookmarks, add_bookmark, remove_bookmark,
-    clear_reading_progress, delete_reading_progress
+    clear_reading_progress, delete_reading_progress, get_user_stats,
+    authenticate_user, update_user_password
 )
 from dependencies import get_current_user
 
@@ -55,10 +60,8 @@ class ForcedPasswordChange(BaseModel):
 # --- User Account Routes ---
 
 @router.post("/users/me/password")
-async def change_password(data: PasswordChange, current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, str]:
+def change_password(data: PasswordChange, current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, str]:
     """Change current user's password"""
-    from db.users import authenticate_user, update_user_password
-    
     # Verify current password
     user = authenticate_user(current_user['username'], data.current_password)
     if not user:
@@ -69,10 +72,8 @@ async def change_password(data: PasswordChange, current_user: Dict[str, Any] = D
     return {"message": "Password updated successfully"}
 
 @router.post("/users/me/password/force")
-async def force_change_password(data: ForcedPasswordChange, current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, str]:
+def force_change_password(data: ForcedPasswordChange, current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, str]:
     """Change current user's password when forced (must_change_password=True)"""
-    from db.users import update_user_password
-    
     if not current_user.get('must_change_password'):
         raise HTTPException(status_code=400, detail="Forced password change not required")
     
@@ -84,40 +85,37 @@ async def force_change_password(data: ForcedPasswordChange, current_user: Dict[s
     return {"message": "Password updated successfully"}
 
 @router.get("/users/me/stats")
-async def get_my_stats(current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
+def get_my_stats(current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
     """Get reading statistics for the current user"""
-    from db.progress import get_user_stats
     return get_user_stats(current_user['id'])
 
 # --- Reading Progress Routes ---
 
 @router.get("/progress")
-async def get_all_progress(current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
-    """Get all reading progress for current user"""
-    progress = get_reading_progress(current_user['id'])
-    if progress is None:
-        return {}
-    return progress
+def get_all_progress(current_user: Dict[str, Any] = Depends(get_current_user)) -> StreamingResponse:
+    """Get all reading progress for current user, keyed by comic_id.
+    
+    Heavy readers can have tens of thousands of entries, so the JSON object
+    is streamed batch by batch instead of being built in memory.
+    """
+    def generate() -> Iterator[bytes]:
+        yield b'{'
+        first = True
+        for batch in iter_reading_progress(current_user['id']):
+            body = json.dumps({p['comic_id']: p for p in batch})[1:-1]
+            yield (body if first else ',' + body).encode()
+            first = False
+        yield b'}'
+    
+    return StreamingResponse(generate(), media_type="application/json")
 
 @router.get("/progress/recent")
-async def get_recent_progress(current_user: Dict[str, Any] = Depends(get_current_user), limit: int = 12) -> List[Dict[str, Any]]:
+def get_recent_progress(current_user: Dict[str, Any] = Depends(get_current_user), limit: int = 12) -> List[Dict[str, Any]]:
     """Get recently read comics with progress"""
-    progress = get_reading_progress(current_user['id'])
-    
-    # Sort by last_read and get most recent
-    if progress:
-        sorted_progress = sorted(
-            progress.values(),
-            key=lambda x: x.get('last_read') or '',
-            reverse=True
-        )[:limit]
-    else:
-        sorted_progress = []
-    
-    return sorted_progress
+    return db_get_recent_progress(current_user['id'], limit)
 
 @router.get("/progress/{comic_id}")
-async def get_comic_progress(comic_id: str, current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
+def get_comic_progress(comic_id: str, current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
     """Get reading progress for specific comic"""
     progress = get_reading_progress(current_user['id'], comic_id)
     if progress:
@@ -136,7 +134,7 @@ async def get_comic_progress(comic_id: str, current_user: Dict[str, Any] = Depen
     }
 
 @router.post("/progress")
-async def update_progress(progress_data: ReadingProgressUpdate, current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, str]:
+def update_progress(progress_data: ReadingProgressUpdate, current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, str]:
     """Update reading progress"""
     update_reading_progress(
         current_user['id'],
@@ -152,13 +150,13 @@ async def update_progress(progress_data: ReadingProgressUpdate, current_user: Di
     return {"message": "Progress updated"}
 
 @router.delete("/progress")
-async def clear_history(current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, str]:
+def clear_history(current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, str]:
     """Clear all reading history for current user"""
     clear_reading_progress(current_user['id'])
     return {"message": "Reading history cleared"}
 
 @router.delete("/progress/{comic_id}")
-async def delete_comic_history(comic_id: str, current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, str]:
+def delete_comic_history(comic_id: str, current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, str]:
     """Delete reading progress for specific comic"""
     delete_reading_progress(current_user['id'], comic_id)
     return {"message": "Comic history removed"}
@@ -166,7 +164,7 @@ async def delete_comic_history(comic_id: str, current_user: Dict[str, Any] = Dep
 # --- User Preferences Routes ---
 
 @router.get("/preferences")
-async def get_preferences(current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
+def get_preferences(current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
     """Get user preferences"""
     prefs = get_user_preferences(current_user['id'])
     if prefs:
@@ -174,10 +172,10 @@ async def get_preferences(current_user: Dict[str, Any] = Depends(get_current_use
     raise HTTPException(status_code=404, detail="Preferences not found")
 
 @router.put("/preferences")
-async def update_preferences(prefs_data: PreferencesUpdate, current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, str]:
+def update_preferences(prefs_data: PreferencesUpdate, current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, str]:
     """Update user preferences"""
-    # Filter out None values
-    updates = {k: v for k, v in prefs_data.dict().items() if v is not None}
+    # Only fields the client actually set to a value
+    updates = prefs_data.model_dump(exclude_none=True)
     
     if not updates:
         raise HTTPException(status_code=400, detail="No preferences to update")
@@ -191,19 +189,19 @@ async def update_preferences(prefs_data: PreferencesUpdate, current_user: Dict[s
 # --- Bookmark Routes ---
 
 @router.get("/bookmarks")
-async def get_user_bookmarks(current_user: Dict[str, Any] = Depends(get_current_user)) -> List[Dict[str, Any]]:
+def get_user_bookmarks(current_user: Dict[str, Any] = Depends(get_current_user)) -> List[Dict[str, Any]]:
     """Get all bookmarks for current user"""
     bookmarks = get_bookmarks(current_user['id'])
     return bookmarks
 
 @router.get("/bookmarks/{comic_id}")
-async def get_comic_bookmarks(comic_id: str, current_user: Dict[str, Any] = Depends(get_current_user)) -> List[Dict[str, Any]]:
+def get_comic_bookmarks(comic_id: str, current_user: Dict[str, Any] = Depends(get_current_user)) -> List[Dict[str, Any]]:
     """Get bookmarks for specific comic"""
     bookmarks = get_bookmarks(current_user['id'], comic_id)
     return bookmarks
 
 @router.post("/bookmarks")
-async def create_bookmark(bookmark_data: BookmarkCreate, current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, str]:
+def create_bookmark(bookmark_data: BookmarkCreate, current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, str]:
     """Add a bookmark"""
     success = add_bookmark(
         current_user['id'],
@@ -217,7 +215,7 @@ async def create_bookmark(bookmark_data: BookmarkCreate, current_user: Dict[str,
     raise HTTPException(status_code=400, detail="Bookmark already exists")
 
 @router.delete("/bookmarks/{comic_id}/{page_number}")
-async def delete_bookmark(comic_id: str, page_number: int, current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, str]:
+def delete_bookmark(comic_id: str, page_number: int, current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, str]:
     """Remove a bookmark"""
     remove_bookmark(current_user['id'], comic_id, page_number)
     return {"message": "Bookmark removed"}
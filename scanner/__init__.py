@@ -1,5 +1,5 @@
-from .utils import is_cbr_or_cbz, get_file_size_str, natural_sort_key, parse_filename_info, parse_series_json
-from .archives import extract_cover_image, save_thumbnail
+from .utils import is_cbr_or_cbz, is_image_name, get_file_size_str, natural_sort_key, parse_filename_info, parse_series_json, walk_files, walk_files_parallel
+from .archives import extract_cover_image, save_thumbnail, read_cbr_member, read_cbr_members, image_members, sorted_image_names
 from .tasks import (
     sync_library_task, process_library_task, 
     full_scan_library_task, rescan_library_task,
@@ -1,18 +1,77 @@
 import os
+import json
 import zipfile
 import rarfile
-from typing import Union, Dict, List, Any, Optional, Tuple
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Union, Dict, List, Any, Optional, Tuple, Iterator
 from io import BytesIO
-from PIL import Image
-from config import IMG_EXTENSIONS, get_thumbnail_path
-from .utils import natural_sort_key
+from config import get_thumbnail_path
+from .utils import natural_sort_key, is_image_name
 from logger import logger
 
+try:
+    # libarchive-c decodes RAR in-process instead of spawning unrar per open
+    import libarchive
+except ImportError:
+    libarchive = None
+
+def read_cbr_member(filepath: str, member: str) -> bytes:
+    """Read a single image out of a CBR, preferring in-process libarchive over rarfile."""
+    if libarchive is not None:
+        with libarchive.file_reader(filepath) as archive:
+            for entry in archive:
+                if entry.pathname == member:
+                    return b''.join(entry.get_blocks())
+        raise KeyError(f"{member} not found in {filepath}")
+    with rarfile.RarFile(filepath) as r:
+        return r.read(member)
+
+def read_cbr_members(filepath: str, members: List[str]) -> Iterator[Tuple[str, bytes]]:
+    """Yield (name, data) for several CBR members. With libarchive this is one
+    in-process pass over the archive instead of an unrar run per member."""
+    if libarchive is not None:
+        wanted = set(members)
+        with libarchive.file_reader(filepath) as archive:
+            for entry in archive:
+                if entry.pathname in wanted:
+                    yield entry.pathname, b''.join(entry.get_blocks())
+        return
+    with rarfile.RarFile(filepath) as r:
+        for member in members:
+            yield member, r.read(member)
+
+def image_members(archive: Any) -> List[str]:
+    """Image members of an open ZipFile or RarFile in archive order, skipping directories."""
+    return [info.filename for info in archive.infolist()
+            if not info.is_dir() and is_image_name(info.filename)]
+
+def sorted_image_names(archive: Any) -> List[str]:
+    """Natural-sorted image members of an open ZipFile or RarFile."""
+    names = image_members(archive)
+    names.sort(key=natural_sort_key)
+    return names
+
+def _open_image(archive: Any, filepath: str, name: str) -> Any:
+    """Open one member for reading. Listing a RAR is in-process, but rarfile
+    spawns unrar to decode a member, so use libarchive for CBRs when it is available."""
+    if libarchive is not None and isinstance(archive, rarfile.RarFile):
+        return BytesIO(read_cbr_member(filepath, name))
+    return archive.open(name)
+
+@lru_cache(maxsize=None)
+def _pil_image() -> Any:
+    """Import Pillow on first use and apply its process-wide settings once.
+    Deferred so Pillow is only loaded once a thumbnail is actually generated."""
+    from PIL import Image, ImageFile
+    ImageFile.LOAD_TRUNCATED_IMAGES = True
+    return Image
+
 def save_thumbnail(f_img: Any, comic_id: str, item_name: str, settings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Helper to process and save thumbnail. Returns dict with success, ext, size, saved, error."""
     result = {'success': False, 'ext': None, 'size': 0, 'saved': 0, 'error': None}
     try:
-        from io import BytesIO
+        Image = _pil_image()
         
         # Default settings
         quality = 70
@@ -55,21 +114,19 @@ def save_thumbnail(f_img: Any, comic_id: str, item_name: str, settings: Optional
                     f.write(buf_jpg.getvalue())
                 result.update({'success': True, 'ext': 'jpg', 'size': size_jpg, 'saved': size_webp - size_jpg})
                 
-        elif fmt == 'png':
-            img.save(f"{cache_path_no_ext}.png", format="PNG", optimize=True)
-            result['success'] = True
-            result['ext'] = 'png'
-            result['size'] = os.path.getsize(f"{cache_path_no_ext}.png")
-        elif fmt in ('jpg', 'jpeg'):
-            img.save(f"{cache_path_no_ext}.jpg", format="JPEG", quality=quality, optimize=True)
-            result['success'] = True
-            result['ext'] = 'jpg'
-            result['size'] = os.path.getsize(f"{cache_path_no_ext}.jpg")
         else:
-            img.save(f"{cache_path_no_ext}.webp", format="WEBP", quality=quality, optimize=True)
-            result['success'] = True
-            result['ext'] = 'webp'
-            result['size'] = os.path.getsize(f"{cache_path_no_ext}.webp")
+            # Saving through our own handle gives the size from tell(),
+            # without stat'ing the file we just wrote
+            if fmt == 'png':
+                ext, save_args = 'png', {'format': "PNG", 'optimize': True}
+            elif fmt in ('jpg', 'jpeg'):
+                ext, save_args = 'jpg', {'format': "JPEG", 'quality': quality, 'optimize': True}
+            else:
+                ext, save_args = 'webp', {'format': "WEBP", 'quality': quality, 'optimize': True}
+            with open(f"{cache_path_no_ext}.{ext}", "wb") as f:
+                img.save(f, **save_args)
+                size = f.tell()
+            result.update({'success': True, 'ext': ext, 'size': size})
             
         return result
     except Exception as e:
@@ -77,6 +134,43 @@ def save_thumbnail(f_img: Any, comic_id: str, item_name: str, settings: Optional
         logger.error(result['error'])
         return result
 
+# Leading bytes of each container: local-file/empty/spanned ZIP headers, and
+# the RAR marker shared by RAR4 ("Rar!\x1a\x07\x00") and RAR5 ("...\x01\x00")
+_ARCHIVE_MAGIC = {
+    '.cbz': (b'PK\x03\x04', b'PK\x05\x06', b'PK\x07\x08'),
+    '.cbr': (b'Rar!\x1a\x07',),
+}
+
+def _check_magic(filepath: str, file_ext: str) -> None:
+    """Reject files whose header doesn't match their extension before
+    zipfile/rarfile parse them (a stub or corrupt file otherwise costs a
+    full directory scan before failing)."""
+    with open(filepath, 'rb') as f:
+        head = f.read(8)
+    if not head.startswith(_ARCHIVE_MAGIC[file_ext]):
+        kind = 'ZIP' if file_ext == '.cbz' else 'RAR'
+        raise ValueError(f"not a {kind} archive (bad header)")
+
+# Tail of a CBZ hinted to the kernel before zipfile reads its central directory
+_ZIP_TAIL_PREFETCH = 64 * 1024
+
+@contextmanager
+def _open_zip(filepath: str) -> Iterator[zipfile.ZipFile]:
+    """
+    Open a CBZ on one file handle shared by the header check and zipfile.
+    The end-of-central-directory record and the directory itself sit in the
+    file's tail, which zipfile reads with several small seek-back reads, so
+    that range is prefetched with POSIX_FADV_WILLNEED where the OS has it.
+    """
+    with open(filepath, 'rb') as f:
+        if not f.read(8).startswith(_ARCHIVE_MAGIC['.cbz']):
+            raise ValueError("not a ZIP archive (bad header)")
+        if hasattr(os, 'posix_fadvise'):
+            size = f.seek(0, os.SEEK_END)
+            os.posix_fadvise(f.fileno(), max(0, size - _ZIP_TAIL_PREFETCH), 0, os.POSIX_FADV_WILLNEED)
+        with zipfile.ZipFile(f) as z:
+            yield z
+
 def extract_cover_image(filepath: str, comic_id: str, settings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Opens an archive, finds first image, saves to cache. 
@@ -87,20 +181,24 @@ def extract_cover_image(filepath: str, comic_id: str, settings: Optional[Dict[st
         file_ext = os.path.splitext(filepath)[1].lower()
 
         if file_ext == '.cbz':
-            with zipfile.ZipFile(filepath, 'r') as z:
-                names = sorted([n for n in z.namelist() if n.lower().endswith(IMG_EXTENSIONS)], key=natural_sort_key)
+            with _open_zip(filepath) as z:
+                names = image_members(z)
                 if names:
-                    with z.open(names[0]) as f_img:
-                        return save_thumbnail(f_img, comic_id, names[0], settings)
+                    # Only the cover is needed here, so take the minimum rather than sorting
+                    first = min(names, key=natural_sort_key)
+                    with z.open(first) as f_img:
+                        return save_thumbnail(f_img, comic_id, first, settings)
                 result['error'] = "No images found in archive"
                 return result
         elif file_ext == '.cbr':
             try:
+                _check_magic(filepath, file_ext)
                 with rarfile.RarFile(filepath) as r:
-                    names = sorted([n for n in r.namelist() if n.lower().endswith(IMG_EXTENSIONS)], key=natural_sort_key)
+                    names = image_members(r)
                     if names:
-                        with r.open(names[0]) as f_img:
-                            return save_thumbnail(f_img, comic_id, names[0], settings)
+                        first = min(names, key=natural_sort_key)
+                        with _open_image(r, filepath, first) as f_img:
+                            return save_thumbnail(f_img, comic_id, first, settings)
                     result['error'] = "No images found in archive"
                     return result
             except Exception as e:
@@ -125,6 +223,7 @@ def _process_single_comic(comic_id: str, filepath: str, settings: Optional[Dict[
         'filepath': filepath,
         'filename': os.path.basename(filepath),
         'pages': 0,
+        'pages_index': None,
         'has_thumb': False,
         'thumbnail_ext': None,
         'thumb_size': 0,
@@ -133,45 +232,37 @@ def _process_single_comic(comic_id: str, filepath: str, settings: Optional[Dict[
         'file_missing': False,
     }
     
-    if not os.path.exists(filepath):
-        result['errors'].append(f"Comic file not found: {filepath}")
-        result['file_missing'] = True
+    file_ext = os.path.splitext(filepath)[1].lower()
+    if file_ext == '.cbz':
+        open_archive = _open_zip
+    elif file_ext == '.cbr':
+        open_archive = rarfile.RarFile
+    else:
         return result
-    
+
+    # One open per archive: the name listing gives the page count and index,
+    # and the cover is streamed from the same handle. A missing file surfaces
+    # as FileNotFoundError from the header check, so no exists() stat is needed.
     try:
-        file_ext = os.path.splitext(filepath)[1].lower()
-        
-        if file_ext == '.cbz':
-            with zipfile.ZipFile(filepath, 'r') as z:
-                img_names = [n for n in z.namelist() if n.lower().endswith(IMG_EXTENSIONS)]
-                result['pages'] = len(img_names)
-                if img_names:
-                    img_names.sort(key=natural_sort_key)
-                    with z.open(img_names[0]) as f_img:
-                        thumb_result = save_thumbnail(f_img, comic_id, img_names[0], settings)
-                        if thumb_result['success']:
-                            result['has_thumb'] = True
-                            result['thumbnail_ext'] = thumb_result['ext']
-                            result['thumb_size'] = thumb_result['size']
-                            result['thumb_saved'] = thumb_result['saved']
-                        else:
-                            result['errors'].append(thumb_result['error'])
-                            
-        elif file_ext == '.cbr':
-            with rarfile.RarFile(filepath) as r:
-                img_names = [n for n in r.namelist() if n.lower().endswith(IMG_EXTENSIONS)]
-                result['pages'] = len(img_names)
-                if img_names:
-                    img_names.sort(key=natural_sort_key)
-                    with r.open(img_names[0]) as f_img:
-                        thumb_result = save_thumbnail(f_img, comic_id, img_names[0], settings)
-                        if thumb_result['success']:
-                            result['has_thumb'] = True
-                            result['thumbnail_ext'] = thumb_result['ext']
-                            result['thumb_size'] = thumb_result['size']
-                            result['thumb_saved'] = thumb_result['saved']
-                        else:
-                            result['errors'].append(thumb_result['error'])
+        if file_ext == '.cbr':
+            _check_magic(filepath, file_ext)
+        with open_archive(filepath) as archive:
+            img_names = sorted_image_names(archive)
+            result['pages'] = len(img_names)
+            if img_names:
+                result['pages_index'] = json.dumps(img_names)
+                with _open_image(archive, filepath, img_names[0]) as f_img:
+                    thumb_result = save_thumbnail(f_img, comic_id, img_names[0], settings)
+                    if thumb_result['success']:
+                        result['has_thumb'] = True
+                        result['thumbnail_ext'] = thumb_result['ext']
+                        result['thumb_size'] = thumb_result['size']
+                        result['thumb_saved'] = thumb_result['saved']
+                    else:
+                        result['errors'].append(thumb_result['error'])
+    except FileNotFoundError:
+        result['errors'].append(f"Comic file not found: {filepath}")
+        result['file_missing'] = True
     except Exception as e:
         result['errors'].append(f"Error processing {filepath}: {e}")
         logger.error(f"Error processing {filepath}: {e}")
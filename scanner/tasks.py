@@ -1,82 +1,111 @@
 import os
+import re
 import hashlib
 import json
+import time
 import sqlite3
+import multiprocessing
 from typing import Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from config import COMICS_DIR
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from config import COMICS_DIR, VIBE_SCAN_PROCESSES
 from database import (
-    get_db_connection, create_or_update_series,
+    get_db_connection, create_or_update_series, upsert_series_batch,
     update_scan_progress, complete_scan_job, delete_comics_by_ids,
     get_pending_comics, create_scan_job, check_scan_cancellation
 )
-from .utils import is_cbr_or_cbz, get_file_size_str, parse_filename_info, parse_series_json
+from .utils import is_cbr_or_cbz, get_file_size_str, parse_filename_info, parse_series_json, walk_files_parallel
 from .archives import _process_single_comic
 from logger import logger
 
+# Strips trailing volume/chapter markers when deriving a series name from a filename.
+_SERIES_SUFFIX_RE = re.compile(r'\s*(v|c|vol|chapter|ch)\s*\.?\s*\d+.*$', re.IGNORECASE)
+
+# Minimum seconds between scan_jobs progress writes
+PROGRESS_INTERVAL = 2.0
+
+def _comic_id(path: str) -> str:
+    """Stable comic id derived from the path; not a security boundary.
+    
+    Kept as md5(path) so a file that disappears and comes back (an unmounted
+    share, a restored folder) gets its old id and finds its reading
+    progress, bookmarks and list entries again.
+    """
+    return hashlib.md5(path.encode('utf-8'), usedforsecurity=False).hexdigest()
+
 # Normalize COMICS_DIR for local use
 _comics_dir = os.path.normpath(os.path.abspath(COMICS_DIR))
+# Length of "_comics_dir/" (the root directory already ends in a separator)
+_comics_prefix_len = len(os.path.join(_comics_dir, ''))
 
 def sync_library_task(job_id: Optional[int] = None) -> Tuple[int, int]:
     """PHASE 1: Synchronize file system with database."""
     logger.info("Phase 1: Synchronizing library structure...")
     conn = get_db_connection()
     
-    db_comics = conn.execute("SELECT id, path, mtime, size_bytes FROM comics").fetchall()
-    db_meta = {row['id']: {'path': row['path'], 'mtime': row['mtime'], 'size': row['size_bytes']} for row in db_comics}
-    db_ids = set(db_meta.keys())
+    # One preload answers every "is this file known / unchanged?" check
+    # below. Keyed by path so files already in the library reuse their
+    # stored id instead of re-hashing the path on every scan.
+    cursor = conn.execute("SELECT path, id, mtime, size_bytes FROM comics")
+    cursor.row_factory = None
+    db_meta = {path: (comic_id, mtime, size) for path, comic_id, mtime, size in cursor}
+    known_ids = {meta[0] for meta in db_meta.values()}
     
     on_disk_ids = set()
-    new_comics = []
-    changed_comics = []
-    series_map = {}
-    dir_metadata_cache = {}
+    # Pending writes are kept as bare row tuples in statement parameter order
+    # rather than per-comic dicts, so the walk's footprint stays small
+    new_comics = []      # comics INSERT params, minus the trailing series_id
+    changed_comics = []  # (size_str, size_bytes, mtime, id) for the UPDATE
+    series_map = {}      # name -> upsert_series_batch entry
+    # series.json is only parsed once a new or changed comic needs it: each
+    # directory records which file applies (its own or an ancestor's), and
+    # parsed results are shared by every directory that inherits them
+    dir_series_json = {}  # directory -> effective series.json path or None
+    series_json_cache = {}  # series.json path -> parsed metadata
     
     file_count = 0
     new_count = 0
     changed_count = 0
+    next_progress = 0.0
     
-    import re
-    
-    for root, dirs, files in os.walk(_comics_dir):
-        abs_root = os.path.abspath(root)
-        rel_path = os.path.relpath(abs_root, _comics_dir)
+    for root, file_entries in walk_files_parallel(_comics_dir, prestat=is_cbr_or_cbz):
+        # The walk joins entry names onto the normalized absolute
+        # _comics_dir, so every root is absolute and starts with that
+        # prefix; slicing it off replaces a relpath() call per directory.
+        rel_path = root[_comics_prefix_len:] or '.'
         
-        series_json_path = os.path.join(root, "series.json")
-        current_metadata = None
-        if os.path.exists(series_json_path):
-            current_metadata = parse_series_json(series_json_path)
-            dir_metadata_cache[abs_root] = current_metadata
+        if any(entry.name == "series.json" for entry in file_entries):
+            series_json_path = os.path.join(root, "series.json")
         else:
-            check_path = abs_root
-            while check_path.startswith(_comics_dir):
-                if check_path in dir_metadata_cache:
-                    current_metadata = dir_metadata_cache[check_path]
-                    break
-                check_path = os.path.dirname(check_path)
+            # The walk is top-down, so the parent's entry is already recorded
+            series_json_path = dir_series_json.get(os.path.dirname(root))
+        dir_series_json[root] = series_json_path
         
         path_parts = [] if rel_path == '.' else rel_path.split(os.sep)
         
-        for filename in files:
-            if job_id and file_count % 20 == 0:
-                if check_scan_cancellation(job_id):
-                    logger.warning(f"Scan job {job_id} cancelled during sync phase.")
-                    conn.close()
-                    complete_scan_job(job_id, status='failed', errors=['Scan cancelled by user'])
-                    return 0, 0
-            
+        for entry in file_entries:
+            filename = entry.name
             if is_cbr_or_cbz(filename):
                 file_count += 1
-                filepath = os.path.join(root, filename)
-                comic_id = hashlib.md5(filepath.encode('utf-8')).hexdigest()
-                on_disk_ids.add(comic_id)
-                
-                stat = os.stat(filepath)
+                filepath = entry.path
+                # entry.stat() is served from the walk's prestat cache
+                stat = entry.stat()
                 mtime = int(stat.st_mtime)
                 size_bytes = stat.st_size
                 
-                is_new = comic_id not in db_ids
-                is_changed = not is_new and (db_meta[comic_id]['mtime'] != mtime or db_meta[comic_id]['size'] != size_bytes)
+                known = db_meta.get(filepath)
+                if known is not None:
+                    # Warm path: a stored path is never new, and an unchanged
+                    # file falls straight through to the progress check
+                    comic_id = known[0]
+                    is_new = False
+                    is_changed = known[1] != mtime or known[2] != size_bytes
+                else:
+                    comic_id = _comic_id(filepath)
+                    is_new = comic_id not in known_ids
+                    # A known id under a different stored path has no usable
+                    # (mtime, size) to compare, so treat it as changed
+                    is_changed = not is_new
+                on_disk_ids.add(comic_id)
                 
                 if is_new or is_changed:
                     if is_new: new_count += 1
@@ -87,30 +116,39 @@ def sync_library_task(job_id: Optional[int] = None) -> Tuple[int, int]:
                     if len(path_parts) >= 3: series = path_parts[2]
                     else:
                         series = os.path.splitext(filename)[0]
-                        series = re.sub(r'\s*(v|c|vol|chapter|ch)\s*\.?\s*\d+.*$', '', series, flags=re.IGNORECASE).strip()
+                        series = _SERIES_SUFFIX_RE.sub('', series).strip()
+                    
+                    current_metadata = None
+                    if series_json_path is not None:
+                        current_metadata = series_json_cache.get(series_json_path)
+                        if current_metadata is None:
+                            current_metadata = series_json_cache[series_json_path] = parse_series_json(series_json_path)
                     
                     if current_metadata:
                         series = current_metadata.get('series') or current_metadata.get('title') or series
                     
-                    vol, ch = parse_filename_info(filename)
-                    
-                    comic_data = {
-                        'id': comic_id, 'path': filepath, 'title': series, 'series': series,
-                        'category': category, 'filename': filename, 'size_str': get_file_size_str(size_bytes),
-                        'size_bytes': size_bytes, 'mtime': mtime, 'volume': vol, 'chapter': ch,
-                        'metadata': current_metadata, 'subcategory': subcategory
-                    }
-                    
-                    if is_new: new_comics.append(comic_data)
-                    else: changed_comics.append(comic_data)
+                    size_str = get_file_size_str(size_bytes)
+                    if is_new:
+                        vol, ch = parse_filename_info(filename)
+                        new_comics.append((
+                            comic_id, filepath, series, series, category, filename,
+                            size_str, size_bytes, mtime, vol, ch
+                        ))
+                    else:
+                        changed_comics.append((size_str, size_bytes, mtime, comic_id))
                     
                     if series not in series_map:
-                        series_map[series] = {
-                            'metadata': current_metadata, 'category': category,
-                            'subcategory': subcategory, 'cover_id': comic_id
-                        }
+                        series_map[series] = (series, current_metadata, category, subcategory, comic_id)
                 
-                if job_id and file_count % 50 == 0:
+                # The walk covers thousands of files a second, so the
+                # cancellation poll and progress commit are paced by time
+                # rather than issued every few dozen files
+                if job_id and time.monotonic() >= next_progress:
+                    if check_scan_cancellation(job_id):
+                        logger.warning(f"Scan job {job_id} cancelled during sync phase.")
+                        conn.close()
+                        complete_scan_job(job_id, status='failed', errors=['Scan cancelled by user'])
+                        return 0, 0
                     update_scan_progress(
                         job_id, file_count, 
                         current_file=os.path.join(rel_path, filename), phase="Phase 1: Syncing",
@@ -119,12 +157,18 @@ def sync_library_task(job_id: Optional[int] = None) -> Tuple[int, int]:
                     )
                     conn.execute("UPDATE scan_jobs SET total_comics = ? WHERE id = ?", (file_count, job_id))
                     conn.commit()
+                    next_progress = time.monotonic() + PROGRESS_INTERVAL
 
     if job_id:
+        update_scan_progress(
+            job_id, file_count, phase="Phase 1: Syncing",
+            new_comics=new_count, changed_comics=changed_count,
+            conn=conn
+        )
         conn.execute("UPDATE scan_jobs SET total_comics = ? WHERE id = ?", (file_count, job_id))
         conn.commit()
 
-    missing_ids = db_ids - on_disk_ids
+    missing_ids = known_ids - on_disk_ids
     deleted_count = len(missing_ids)
     if missing_ids:
         delete_comics_by_ids(list(missing_ids), conn=conn)
@@ -133,13 +177,15 @@ def sync_library_task(job_id: Optional[int] = None) -> Tuple[int, int]:
         conn.commit()
     
     if changed_comics:
-        update_data = [(c['size_str'], c['size_bytes'], c['mtime'], c['id']) for c in changed_comics]
-        batch_size = 50
+        update_data = changed_comics
+        # Committed per batch so progress stays visible; 50-row batches made
+        # the commit, not the UPDATE, the dominant cost
+        batch_size = 1000
         for i in range(0, len(update_data), batch_size):
             batch = update_data[i:i+batch_size]
             conn.executemany('''
                 UPDATE comics SET 
-                    size_str = ?, size_bytes = ?, mtime = ?, pages = NULL, processed = 0, has_thumbnail = 0
+                    size_str = ?, size_bytes = ?, mtime = ?, pages = NULL, pages_index = NULL, processed = 0, has_thumbnail = 0
                 WHERE id = ?
             ''', batch)
             conn.commit()
@@ -154,42 +200,26 @@ def sync_library_task(job_id: Optional[int] = None) -> Tuple[int, int]:
                 conn.commit()
 
     if new_comics:
-        series_id_map = {}
-        for series_name, s_info in series_map.items():
-            series_id = create_or_update_series(
-                name=series_name,
-                metadata=s_info['metadata'],
-                category=s_info['category'],
-                subcategory=s_info['subcategory'],
-                cover_comic_id=s_info['cover_id'],
-                conn=conn
-            )
-            series_id_map[series_name] = series_id
-        conn.commit()
+        insert_sql = '''
+            INSERT INTO comics (id, path, title, series, category, filename, size_str, size_bytes, mtime, pages, processed, volume, chapter, series_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, 0, ?, ?, ?)
+        '''
+        # Series upserts and comic inserts share one transaction (one WAL
+        # sync for the whole phase instead of one per batch)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            series_id_map = upsert_series_batch(list(series_map.values()), conn=conn)
             
-        batch = []
-        for comic in new_comics:
-            series_id = series_id_map.get(comic['series'])
-            batch.append((
-                comic['id'], comic['path'], comic['title'], comic['series'],
-                comic['category'], comic['filename'], comic['size_str'],
-                comic['size_bytes'], comic['mtime'], comic['volume'], comic['chapter'], series_id
-            ))
-            
-            if len(batch) >= 500:
-                conn.executemany('''
-                    INSERT INTO comics (id, path, title, series, category, filename, size_str, size_bytes, mtime, pages, processed, volume, chapter, series_id)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, 0, ?, ?, ?)
-                ''', batch)
-                conn.commit()
-                batch = []
-        
-        if batch:
-            conn.executemany('''
-                INSERT INTO comics (id, path, title, series, category, filename, size_str, size_bytes, mtime, pages, processed, volume, chapter, series_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, 0, ?, ?, ?)
-            ''', batch)
+            # executemany binds straight from the generator, so no batch
+            # lists are built; row[3] is the series name
+            conn.executemany(
+                insert_sql,
+                (row + (series_id_map.get(row[3]),) for row in new_comics)
+            )
             conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
     
     # Invalidate tag cache so new metadata is reflected immediately
     from database import invalidate_tag_cache
@@ -199,6 +229,10 @@ def sync_library_task(job_id: Optional[int] = None) -> Tuple[int, int]:
     from db.nsfw import recompute_nsfw_flags
     recompute_nsfw_flags()
 
+    # Refresh planner statistics once the library's shape has changed
+    if new_comics or deleted_count:
+        conn.execute("ANALYZE")
+
     conn.close()
     return len(new_comics) + len(changed_comics), deleted_count
 
@@ -223,7 +257,8 @@ def process_library_task(job_id: Optional[int] = None) -> None:
         conn.commit()
 
     batch_size = 100
-    max_workers = 4
+    # Pillow decode/resize releases the GIL, so even threads scale with cores
+    max_workers = os.cpu_count() or 4
     processed_count = 0
     pages_done = 0
     pages_err = 0
@@ -232,87 +267,144 @@ def process_library_task(job_id: Optional[int] = None) -> None:
     thumb_bytes_written = 0
     thumb_bytes_saved = 0
     all_scan_errors = []
+    last_path = None
+    last_progress_write = 0.0
     
+    def write_progress() -> None:
+        nonlocal last_progress_write
+        try:
+            last_rel_path = os.path.relpath(last_path, _comics_dir)
+        except ValueError:
+            last_rel_path = os.path.basename(last_path)
+        
+        conn.execute('''
+            UPDATE scan_jobs SET 
+                processed_comics = ?, current_file = ?, phase = ?,
+                processed_pages = ?, page_errors = ?, 
+                processed_thumbnails = ?, thumbnail_errors = ?,
+                thumb_bytes_written = ?, thumb_bytes_saved = ?,
+                errors = ?
+            WHERE id = ?
+        ''', (processed_count, last_rel_path, "Phase 2: Processing",
+              pages_done, pages_err, thumb_done, thumb_err,
+              thumb_bytes_written, thumb_bytes_saved,
+              json.dumps(all_scan_errors) if all_scan_errors else None, job_id))
+        last_progress_write = time.monotonic()
+        
+        if thumb_bytes_saved > 0:
+            saved_mb = thumb_bytes_saved / (1024 * 1024)
+            logger.info(f"Scan progress: Saved {saved_mb:.2f} MB so far via 'Pick Best'")
+    
+    if VIBE_SCAN_PROCESSES:
+        # spawn, not fork: the server process is multi-threaded
+        executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+    else:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
     try:
+        # Keep every worker busy: top the pool up as futures finish instead of
+        # waiting for a whole batch (and its slowest archive) before the next.
+        # Pending comics are paged by id, so the lag before results are
+        # written back can't cause a comic to be picked up twice.
+        window = max_workers * 2
+        queued = []
+        last_id = None
+        exhausted = False
+        in_flight = {}
+        update_buffer = []
+        
+        def flush_updates() -> None:
+            conn.executemany('UPDATE comics SET pages = ?, pages_index = ?, processed = ?, has_thumbnail = ?, thumbnail_ext = ? WHERE id = ?', update_buffer)
+            update_buffer.clear()
+            # Progress is for the UI only: write it at most every couple of
+            # seconds rather than with every batch
+            if job_id and time.monotonic() - last_progress_write >= PROGRESS_INTERVAL:
+                write_progress()
+            conn.commit()
+        
         while True:
-            if job_id and check_scan_cancellation(job_id):
-                logger.warning(f"Scan job {job_id} cancelled during processing phase.")
-                if all_scan_errors is None: all_scan_errors = []
-                all_scan_errors.append({'error': 'Scan cancelled by user'})
-                complete_scan_job(job_id, status='failed', errors=all_scan_errors, conn=conn)
-                conn.commit()
-                return
-
-            pending = get_pending_comics(limit=batch_size, conn=conn)
-            if not pending: break
+            while len(in_flight) < window and not exhausted:
+                if not queued:
+                    queued = get_pending_comics(limit=batch_size, conn=conn, after_id=last_id)
+                    if not queued:
+                        exhausted = True
+                        break
+                    last_id = queued[-1]['id']
+                    queued.reverse()  # pop() from the end in id order
+                comic = queued.pop()
+                in_flight[executor.submit(_process_single_comic, comic['id'], comic['path'], settings)] = comic
             
-            update_buffer = []
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = {executor.submit(_process_single_comic, comic['id'], comic['path'], settings): comic for comic in pending}
-                for future in as_completed(futures):
-                    try:
-                        result = future.result()
-                    except Exception as e:
-                        comic = futures[future]
-                        logger.error(f"Failed to process comic {comic['id']}: {e}", exc_info=True)
-                        processed_count += 1
-                        pages_err += 1
-                        thumb_err += 1
-                        update_buffer.append((0, 1, 0, None, comic['id']))
-                        if len(all_scan_errors) < 100:
-                            all_scan_errors.append({'comic_id': comic['id'], 'filepath': comic['path'], 'errors': [str(e)]})
-                        continue
-                    
+            if not in_flight:
+                break
+            
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                comic = in_flight.pop(future)
+                last_path = comic['path']
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to process comic {comic['id']}: {e}", exc_info=True)
                     processed_count += 1
-                    if result['file_missing'] or (result['errors'] and result['pages'] == 0):
-                        pages_err += 1
-                        thumb_err += 1
-                        update_buffer.append((0, 1, 0, None, result['comic_id']))
-                    else:
-                        if result['pages'] > 0: pages_done += 1
-                        else: pages_err += 1
-                        if result['has_thumb']: 
-                            thumb_done += 1
-                            thumb_bytes_written += result.get('thumb_size', 0)
-                            thumb_bytes_saved += result.get('thumb_saved', 0)
-                        else: thumb_err += 1
-                        update_buffer.append((result['pages'], 1, 1 if result['has_thumb'] else 0, result.get('thumbnail_ext'), result['comic_id']))
-                    
-                    if result['errors'] and len(all_scan_errors) < 100:
-                        all_scan_errors.append({'comic_id': result['comic_id'], 'filepath': result['filepath'], 'errors': result['errors']})
+                    pages_err += 1
+                    thumb_err += 1
+                    update_buffer.append((0, None, 1, 0, None, comic['id']))
+                    if len(all_scan_errors) < 100:
+                        all_scan_errors.append({'comic_id': comic['id'], 'filepath': comic['path'], 'errors': [str(e)]})
+                    continue
+                
+                processed_count += 1
+                if result['file_missing'] or (result['errors'] and result['pages'] == 0):
+                    pages_err += 1
+                    thumb_err += 1
+                    update_buffer.append((0, None, 1, 0, None, result['comic_id']))
+                else:
+                    if result['pages'] > 0: pages_done += 1
+                    else: pages_err += 1
+                    if result['has_thumb']: 
+                        thumb_done += 1
+                        thumb_bytes_written += result.get('thumb_size', 0)
+                        thumb_bytes_saved += result.get('thumb_saved', 0)
+                    else: thumb_err += 1
+                    update_buffer.append((result['pages'], result.get('pages_index'), 1, 1 if result['has_thumb'] else 0, result.get('thumbnail_ext'), result['comic_id']))
+                
+                if result['errors'] and len(all_scan_errors) < 100:
+                    all_scan_errors.append({'comic_id': result['comic_id'], 'filepath': result['filepath'], 'errors': result['errors']})
             
-            if update_buffer:
-                conn.executemany('UPDATE comics SET pages = ?, processed = ?, has_thumbnail = ?, thumbnail_ext = ? WHERE id = ?', update_buffer)
-                if job_id:
-                    last_path = pending[-1]['path']
-                    try:
-                        last_rel_path = os.path.relpath(last_path, _comics_dir)
-                    except ValueError:
-                        last_rel_path = os.path.basename(last_path)
-                        
-                    conn.execute('''
-                        UPDATE scan_jobs SET 
-                            processed_comics = ?, current_file = ?, phase = ?,
-                            processed_pages = ?, page_errors = ?, 
-                            processed_thumbnails = ?, thumbnail_errors = ?,
-                            thumb_bytes_written = ?, thumb_bytes_saved = ?,
-                            errors = ?
-                        WHERE id = ?
-                    ''', (processed_count, last_rel_path, "Phase 2: Processing",
-                          pages_done, pages_err, thumb_done, thumb_err,
-                          thumb_bytes_written, thumb_bytes_saved,
-                          json.dumps(all_scan_errors) if all_scan_errors else None, job_id))
-                    
-                    if processed_count % 50 == 0 and thumb_bytes_saved > 0:
-                        saved_mb = thumb_bytes_saved / (1024 * 1024)
-                        logger.info(f"Scan progress: Saved {saved_mb:.2f} MB so far via 'Pick Best'")
-                conn.commit()
+            if len(update_buffer) >= batch_size:
+                flush_updates()
+                if job_id and check_scan_cancellation(job_id):
+                    logger.warning(f"Scan job {job_id} cancelled during processing phase.")
+                    all_scan_errors.append({'error': 'Scan cancelled by user'})
+                    complete_scan_job(job_id, status='failed', errors=all_scan_errors, conn=conn)
+                    conn.commit()
+                    return
+        
+        if update_buffer:
+            flush_updates()
+        if job_id and last_path:
+            write_progress()
+            conn.commit()
     finally:
+        executor.shutdown(wait=True)
         conn.close()
     
     if job_id:
         complete_scan_job(job_id, status='completed', errors=all_scan_errors if all_scan_errors else None)
 
+def _checkpoint_wal() -> None:
+    """Fold the WAL back into the database file at a scan phase boundary.
+    
+    A scan commits far more than normal traffic, and TRUNCATE also resets
+    the -wal file so later reads don't walk a WAL left large by the scan.
+    """
+    conn = get_db_connection()
+    try:
+        busy = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()[0]
+        if busy:
+            logger.debug("WAL checkpoint skipped: database busy")
+    finally:
+        conn.close()
+
 def full_scan_library_task(job_id: Optional[int] = None) -> None:
     from database import get_running_scan_job
     if job_id is None:
@@ -325,7 +417,9 @@ def full_scan_library_task(job_id: Optional[int] = None) -> None:
     conn.close()
     try:
         sync_library_task(job_id)
+        _checkpoint_wal()
         process_library_task(job_id)
+        _checkpoint_wal()
     except Exception as e:
         logger.error(f"Scan failed: {e}", exc_info=True)
         complete_scan_job(job_id, status='failed', errors=[str(e)])
@@ -344,6 +438,9 @@ def rescan_library_task(job_id: Optional[int] = None) -> None:
     finally:
         conn.close()
     
+    from database import invalidate_series_list_cache
+    invalidate_series_list_cache()
+    
     # Clear thumbnail cache to remove orphans
     logger.info("Clearing thumbnail cache...")
     if os.path.exists(BASE_CACHE_DIR):
@@ -420,10 +517,10 @@ def metadata_rescan_task(job_id: Optional[int] = None) -> None:
         series_json_files = []
         
         # Walk _comics_dir to find all series.json files
-        for root, dirs, files in os.walk(_comics_dir):
-            if 'series.json' in files:
-                series_json_path = os.path.join(root, 'series.json')
-                series_json_files.append(series_json_path)
+        for root, file_entries in walk_files_parallel(_comics_dir):
+            for entry in file_entries:
+                if entry.name == 'series.json':
+                    series_json_files.append(entry.path)
         
         total_files = len(series_json_files)
         conn.execute("UPDATE scan_jobs SET total_comics = ? WHERE id = ?", (total_files, job_id))
@@ -488,6 +585,11 @@ def metadata_rescan_task(job_id: Optional[int] = None) -> None:
             except Exception as e:
                 logger.error(f"Failed to process {series_json_path}: {e}", exc_info=True)
         
+        # Commit before invalidating, or a listing request in between would
+        # re-cache the pre-rescan rows
+        conn.commit()
+        conn.close()
+        
         # Invalidate tag cache so new metadata is reflected immediately
         from database import invalidate_tag_cache
         invalidate_tag_cache()
@@ -496,9 +598,6 @@ def metadata_rescan_task(job_id: Optional[int] = None) -> None:
         from db.nsfw import recompute_nsfw_flags
         recompute_nsfw_flags()
         
-        conn.commit()
-        conn.close()
-        
         logger.info(f"Metadata rescan completed: {processed}/{total_files} files processed")
         complete_scan_job(job_id, status='completed', errors=None)
         
@@ -1,37 +1,153 @@
 import os
 import re
-from typing import List, Union, Tuple, Optional, Dict, Any
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from typing import List, Union, Tuple, Optional, Dict, Any, Iterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from config import IMG_EXTENSIONS
+
+# Compiled once: these run for every file in a scan and every sort key.
+_split_digits = re.compile(r'(\d+)').split
+_VOL_RE = re.compile(r'\bv(?:ol)?\.?\s*(\d+(?:\.\d+)?)', re.IGNORECASE)
+_CH_RE = re.compile(r'\b(?:c|ch|chapter|unit)\.?\s*(\d+(?:\.\d+)?)', re.IGNORECASE)
+_END_NUM_RE = re.compile(r'\s(\d+(?:\.\d+)?)$')
+
+_ARCHIVE_EXT_SET = frozenset(('.cbz', '.cbr'))
+_IMG_EXT_SET = frozenset(ext.lower() for ext in IMG_EXTENSIONS)
+
+def _suffix_in(name: str, extensions: frozenset) -> bool:
+    # Lowercase only the extension, not the whole (often long) member path
+    dot = name.rfind('.')
+    return dot != -1 and name[dot:].lower() in extensions
 
 def is_cbr_or_cbz(filename: str) -> bool:
-    return filename.lower().endswith(('.cbz', '.cbr'))
+    # Both extensions are four characters, so only that tail needs lowercasing
+    return filename[-4:].lower() in _ARCHIVE_EXT_SET
+
+def is_image_name(name: str) -> bool:
+    """True if an archive member name has one of IMG_EXTENSIONS (case-insensitive)."""
+    return _suffix_in(name, _IMG_EXT_SET)
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
 
 def get_file_size_str(size_bytes: int) -> str:
-    size: float = float(size_bytes)
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size < 1024.0:
-            return f"{size:.1f} {unit}"
-        size /= 1024.0
-    return f"{size:.1f} TB"
+    if size_bytes <= 0:
+        return f"{float(size_bytes):.1f} B"
+    # Each unit is 2**10 of the previous, so bit_length picks it directly
+    idx = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (idx * 10)):.1f} {_SIZE_UNITS[idx]}"
+
+def _scan_dir(top: str) -> Optional[Tuple[List[os.DirEntry], List[str]]]:
+    """List one directory as (file_entries, subdir_paths), or None if unreadable."""
+    try:
+        with os.scandir(top) as it:
+            entries = list(it)
+    except OSError:
+        return None
+    
+    files = []
+    subdirs = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if is_dir:
+            if not entry.is_symlink():
+                subdirs.append(entry.path)
+        else:
+            files.append(entry)
+    return files, subdirs
+
+def walk_files(top: str) -> Iterator[Tuple[str, List[os.DirEntry]]]:
+    """Top-down walk like os.walk, yielding (root, file_entries).
+    
+    Entries come straight from os.scandir, so callers can use entry.stat()
+    (free on Windows, cached per entry elsewhere) instead of a separate
+    os.stat per file. Symlinked directories are listed but not followed and
+    unreadable directories are skipped, matching os.walk's defaults.
+    """
+    listing = _scan_dir(top)
+    if listing is None:
+        return
+    files, subdirs = listing
+    
+    yield top, files
+    for path in subdirs:
+        yield from walk_files(path)
+
+def _walk_shard(top: str, prestat: Optional[Callable[[str], bool]]) -> List[Tuple[str, List[os.DirEntry]]]:
+    shard = list(walk_files(top))
+    if prestat is not None:
+        for _, files in shard:
+            for entry in files:
+                if prestat(entry.name):
+                    try:
+                        entry.stat()  # cached on the entry for the consumer
+                    except OSError:
+                        pass  # vanished or unreadable; the consumer sees it too
+    return shard
+
+def walk_files_parallel(top: str, max_workers: int = 8, prestat: Optional[Callable[[str], bool]] = None) -> Iterator[Tuple[str, List[os.DirEntry]]]:
+    """walk_files with each top-level subdirectory walked on its own thread.
+    
+    scandir releases the GIL, so category trees are listed concurrently
+    (a large win on network shares). Results are still yielded in
+    walk_files order, so parents always come before their children.
+    
+    Files whose name passes prestat are stat()ed on the worker threads too,
+    so those stats overlap instead of running one by one in the caller.
+    """
+    listing = _scan_dir(top)
+    if listing is None:
+        return
+    files, subdirs = listing
+    
+    yield top, files
+    if not subdirs:
+        return
+    
+    workers = min(max_workers, len(subdirs))
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        # Only a few shards are listed ahead of the caller, so memory holds a
+        # handful of subtrees' entries rather than the whole library's; the
+        # next shard is submitted before yielding to keep every worker busy
+        remaining = iter(subdirs)
+        pending = deque(executor.submit(_walk_shard, path, prestat) for path in islice(remaining, workers))
+        while pending:
+            shard = pending.popleft().result()
+            for path in islice(remaining, 1):
+                pending.append(executor.submit(_walk_shard, path, prestat))
+            yield from shard
+            shard = None  # drop the consumed shard while waiting on the next
+    finally:
+        # A caller that stops early (e.g. a cancelled scan) drops pending shards
+        executor.shutdown(wait=False, cancel_futures=True)
 
-def natural_sort_key(s: str) -> List[Union[int, str]]:
-    return [int(text) if text.isdigit() else text.lower()
-            for text in re.split(r'(\d+)', s)]
+@lru_cache(maxsize=65536)
+def natural_sort_key(s: str) -> Tuple[Union[int, str], ...]:
+    # Cached: page names like "001.jpg" recur across thousands of archives.
+    # Returns a tuple so cached keys can't be mutated by a caller.
+    return tuple([int(text) if text.isdigit() else text.lower()
+                  for text in _split_digits(s)])
 
 def parse_filename_info(filename: str) -> Tuple[Optional[float], Optional[float]]:
     name = os.path.splitext(filename)[0]
     vol = None
     ch = None
     
-    v_match = re.search(r'\bv(?:ol)?\.?\s*(\d+(?:\.\d+)?)', name, re.IGNORECASE)
+    v_match = _VOL_RE.search(name)
     if v_match:
         vol = float(v_match.group(1))
         
-    c_match = re.search(r'\b(?:c|ch|chapter|unit)\.?\s*(\d+(?:\.\d+)?)', name, re.IGNORECASE)
+    c_match = _CH_RE.search(name)
     if c_match:
         ch = float(c_match.group(1))
         
     if ch is None and vol is None:
-        end_match = re.search(r'\s(\d+(?:\.\d+)?)$', name)
+        end_match = _END_NUM_RE.search(name)
         if end_match:
             ch = float(end_match.group(1))
 
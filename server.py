@@ -38,7 +38,7 @@ app.include_router(ai.router)
 # --- Main Routes ---
 
 @app.get("/")
-async def read_root(request: Request):
+async def read_root(request: Request) -> HTMLResponse:
     index_path = os.path.join(BASE_DIR, "index.html")
     with open(index_path, "r", encoding="utf-8") as f:
         return HTMLResponse(content=f.read(), media_type="text/html")
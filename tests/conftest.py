@@ -44,6 +44,8 @@ db.users.get_db_connection = get_test_connection
 import db.series
 db.series.get_db_connection = get_test_connection
 
+import db.progress
+
 import db.lists
 db.lists.get_db_connection = get_test_connection
 
@@ -61,6 +63,8 @@ def test_db():
     _test_conn.execute("DELETE FROM comics")
     _test_conn.execute("DELETE FROM series")
     _test_conn.commit()
+    db.series.invalidate_tag_cache()
+    db.progress._PREFS_CACHE.clear()
     yield _test_conn
 
 @pytest.fixture(scope="function")
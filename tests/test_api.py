@@ -334,3 +334,257 @@ def test_api_bulk_add(test_client, test_user, test_db):
     assert data["skipped"] == 0
     
     test_client.post("/api/auth/logout")
+
+
+def test_comic_page_uses_pages_index(test_client, test_user, test_db, tmp_path):
+    """Test /api/read/{id}/page/{n} serves pages in the order stored in pages_index"""
+    import json
+    import zipfile
+    
+    cbz_path = tmp_path / "indexed.cbz"
+    with zipfile.ZipFile(cbz_path, 'w') as z:
+        z.writestr("001.jpg", b"first")
+        z.writestr("002.jpg", b"second")
+    
+    test_db.execute(
+        'INSERT INTO comics (id, path, title, series, filename, pages, pages_index, processed) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+        ('indexed-comic', str(cbz_path), 'Indexed', 'Indexed', 'indexed.cbz', 2, json.dumps(["002.jpg", "001.jpg"]), 1)
+    )
+    test_db.commit()
+    
+    login_response = test_client.post("/api/auth/login", json={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    assert login_response.status_code == 200
+    
+    response = test_client.get("/api/read/indexed-comic/page/0")
+    assert response.status_code == 200
+    assert response.content == b"second"
+
+
+def test_comic_page_range_request(test_client, test_user, test_db, tmp_path):
+    """Test /api/read/{id}/page/{n} honors byte Range requests"""
+    import zipfile
+    
+    cbz_path = tmp_path / "ranged.cbz"
+    with zipfile.ZipFile(cbz_path, 'w') as z:
+        z.writestr("001.jpg", b"0123456789")
+    
+    test_db.execute(
+        'INSERT INTO comics (id, path, title, series, filename, pages, processed) VALUES (?, ?, ?, ?, ?, ?, ?)',
+        ('ranged-comic', str(cbz_path), 'Ranged', 'Ranged', 'ranged.cbz', 1, 1)
+    )
+    test_db.commit()
+    
+    login_response = test_client.post("/api/auth/login", json={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    assert login_response.status_code == 200
+    
+    response = test_client.get("/api/read/ranged-comic/page/0")
+    assert response.status_code == 200
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-length"] == "10"
+    
+    response = test_client.get("/api/read/ranged-comic/page/0", headers={"Range": "bytes=2-5"})
+    assert response.status_code == 206
+    assert response.content == b"2345"
+    assert response.headers["content-range"] == "bytes 2-5/10"
+    
+    response = test_client.get("/api/read/ranged-comic/page/0", headers={"Range": "bytes=-3"})
+    assert response.status_code == 206
+    assert response.content == b"789"
+    
+    response = test_client.get("/api/read/ranged-comic/page/0", headers={"Range": "bytes=20-"})
+    assert response.status_code == 416
+
+
+def test_cover_serves_cached_thumbnail(test_client, test_user, test_db):
+    """Test /api/cover/{id} serves an existing thumbnail with validator headers"""
+    import os
+    from config import get_thumbnail_path
+    
+    thumb_path = get_thumbnail_path("cachedcover", "webp")
+    with open(thumb_path, "wb") as f:
+        f.write(b"webp-bytes")
+    
+    try:
+        login_response = test_client.post("/api/auth/login", json={
+            "username": test_user["username"],
+            "password": test_user["password"]
+        })
+        assert login_response.status_code == 200
+        
+        response = test_client.get("/api/cover/cachedcover")
+        assert response.status_code == 200
+        assert response.content == b"webp-bytes"
+        assert "etag" in response.headers
+        assert "last-modified" in response.headers
+    finally:
+        os.remove(thumb_path)
+
+
+def test_books_includes_series_fields(test_client, test_user, test_db):
+    """Test /api/books joins series metadata and parses JSON fields"""
+    series_id = test_db.execute(
+        "INSERT INTO series (name, genres, status) VALUES (?, ?, ?) RETURNING id",
+        ("Books Series", '["Action"]', "Ongoing")
+    ).fetchone()['id']
+    test_db.execute(
+        'INSERT INTO comics (id, path, title, series, category, filename, pages, processed, series_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        ('books-comic', '/library/books.cbz', 'Books Series', 'Books Series', 'Manga', 'books.cbz', 10, 1, series_id)
+    )
+    test_db.commit()
+    
+    login_response = test_client.post("/api/auth/login", json={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    assert login_response.status_code == 200
+    
+    response = test_client.get("/api/books")
+    assert response.status_code == 200
+    item = response.json()["items"][0]
+    assert item["id"] == "books-comic"
+    assert item["pages"] == 10
+    assert item["genres"] == ["Action"]
+    assert item["tags"] == []
+    assert item["series_status"] == "Ongoing"
+    assert "pages_index" not in item
+
+
+def test_read_comic_includes_user_progress(test_client, test_user, test_db):
+    """Test /api/read/{id} returns the comic with the user's progress joined in"""
+    test_db.execute(
+        'INSERT INTO comics (id, path, title, series, filename, pages, processed) VALUES (?, ?, ?, ?, ?, ?, ?)',
+        ('progress-comic', '/library/progress.cbz', 'Progress', 'Progress', 'progress.cbz', 20, 1)
+    )
+    test_db.execute(
+        'INSERT INTO reading_progress (user_id, comic_id, current_page, total_pages, completed) VALUES (?, ?, ?, ?, ?)',
+        (test_user['id'], 'progress-comic', 7, 20, 0)
+    )
+    test_db.commit()
+    
+    login_response = test_client.post("/api/auth/login", json={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    assert login_response.status_code == 200
+    
+    response = test_client.get("/api/read/progress-comic")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["id"] == "progress-comic"
+    assert data["user_progress"]["comic_id"] == "progress-comic"
+    assert data["user_progress"]["current_page"] == 7
+    assert "rp_id" not in data
+    assert "rp_current_page" not in data
+
+
+def test_series_detail_stats_and_progress(test_client, test_user, test_db):
+    """Test /api/series/{name} joins per-comic progress and aggregates stats"""
+    test_db.execute("DELETE FROM series")
+    test_db.execute("DELETE FROM comics")
+    test_db.execute(
+        "INSERT INTO series (id, name, category, title) VALUES (?, ?, ?, ?)",
+        (1, "Stats Series", "Manga", "Stats Series")
+    )
+    for i, pages in enumerate([10, 20, 30], start=1):
+        test_db.execute(
+            'INSERT INTO comics (id, path, title, series, series_id, filename, pages, chapter, processed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (f'stats-{i}', f'/library/stats-{i}.cbz', f'Ch {i}', 'Stats Series', 1, f'stats-{i}.cbz', pages, i, 1)
+        )
+    test_db.execute(
+        'INSERT INTO reading_progress (user_id, comic_id, current_page, total_pages, completed) VALUES (?, ?, ?, ?, ?)',
+        (test_user['id'], 'stats-1', 10, 10, 1)
+    )
+    test_db.execute(
+        'INSERT INTO reading_progress (user_id, comic_id, current_page, total_pages, completed) VALUES (?, ?, ?, ?, ?)',
+        (test_user['id'], 'stats-2', 5, 20, 0)
+    )
+    test_db.commit()
+    
+    login_response = test_client.post("/api/auth/login", json={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    assert login_response.status_code == 200
+    
+    response = test_client.get("/api/series/Stats Series")
+    assert response.status_code == 200
+    data = response.json()
+    assert [c["id"] for c in data["comics"]] == ["stats-1", "stats-2", "stats-3"]
+    assert data["comics"][1]["user_progress"] == {"current_page": 5, "completed": 0}
+    assert "user_progress" not in data["comics"][2]
+    assert "rp_comic_id" not in data["comics"][0]
+    assert data["stats"]["total_comics"] == 3
+    assert data["stats"]["total_pages"] == 60
+    assert data["stats"]["read_pages"] == 15
+    assert data["stats"]["completed_comics"] == 1
+    assert data["stats"]["in_progress_comics"] == 1
+    assert data["continue_reading"]["comic_id"] == "stats-2"
+    assert data["comics"][1]["prev_id"] == "stats-1"
+    assert data["comics"][1]["next_id"] == "stats-3"
+    assert "prev_id" not in data["comics"][0]
+    assert "next_id" not in data["comics"][2]
+
+
+def test_series_detail_continue_prefers_in_progress(test_client, test_user, test_db):
+    """Test continue_reading picks an in-progress comic over an earlier unread one"""
+    test_db.execute(
+        "INSERT INTO series (id, name, category, title) VALUES (?, ?, ?, ?)",
+        (1, "Resume Series", "Manga", "Resume Series")
+    )
+    for i in range(1, 4):
+        test_db.execute(
+            'INSERT INTO comics (id, path, title, series, series_id, filename, pages, chapter, processed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (f'resume-{i}', f'/library/resume-{i}.cbz', f'Ch {i}', 'Resume Series', 1, f'resume-{i}.cbz', 10, i, 1)
+        )
+    test_db.execute(
+        'INSERT INTO reading_progress (user_id, comic_id, current_page, total_pages, completed) VALUES (?, ?, ?, ?, ?)',
+        (test_user['id'], 'resume-3', 4, 10, 0)
+    )
+    test_db.commit()
+    
+    login_response = test_client.post("/api/auth/login", json={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    assert login_response.status_code == 200
+    
+    response = test_client.get("/api/series/Resume Series")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["continue_reading"]["comic_id"] == "resume-3"
+    assert data["continue_reading"]["page"] == 4
+
+
+def test_list_series_pagination(test_client, test_user, test_db):
+    """Test /api/series derives has_more from an extra row and only counts on request"""
+    for i in range(3):
+        test_db.execute(
+            "INSERT INTO series (name, category, title) VALUES (?, ?, ?)",
+            (f"Page Series {i}", "Manga", f"Page Series {i}")
+        )
+    test_db.commit()
+    
+    login_response = test_client.post("/api/auth/login", json={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    assert login_response.status_code == 200
+    
+    data = test_client.get("/api/series?limit=2").json()
+    assert [s["name"] for s in data["items"]] == ["Page Series 0", "Page Series 1"]
+    assert data["has_more"] is True
+    assert "total" not in data
+    
+    data = test_client.get("/api/series?limit=2&offset=2").json()
+    assert len(data["items"]) == 1
+    assert data["has_more"] is False
+    
+    data = test_client.get("/api/series?limit=2&include_total=true").json()
+    assert data["total"] == 3
+    assert data["has_more"] is True
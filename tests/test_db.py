@@ -1,7 +1,11 @@
 import pytest
 import sqlite3
-from db.comics import delete_comics_by_ids
-from db.series import create_or_update_series, get_series_by_name, search_series, add_rating, get_series_rating
+from db.comics import delete_comics_by_ids, get_pending_comics
+from db.series import (
+    create_or_update_series, get_series_by_name, search_series, add_rating, get_series_rating,
+    get_all_series, invalidate_series_list_cache, get_series_metadata, invalidate_tag_cache,
+    upsert_series_batch
+)
 from db.progress import (
     update_reading_progress, get_reading_progress,
     add_bookmark, get_bookmarks, remove_bookmark,
@@ -85,6 +89,22 @@ def test_delete_comics_by_ids(test_db):
     assert remaining['id'] == 'comic-102'
 
 
+def test_get_pending_comics_pages_by_id(test_db):
+    for comic_id, processed in [('c3', 0), ('c1', 0), ('c2', 1), ('c4', 0)]:
+        test_db.execute(
+            'INSERT INTO comics (id, path, title, processed) VALUES (?, ?, ?, ?)',
+            (comic_id, f'/path/{comic_id}.cbz', comic_id, processed)
+        )
+    test_db.commit()
+    
+    first = get_pending_comics(limit=2, conn=test_db)
+    assert [c['id'] for c in first] == ['c1', 'c3']
+    
+    # Keyset paging skips already-fetched ids even while they are still unprocessed
+    rest = get_pending_comics(limit=2, conn=test_db, after_id=first[-1]['id'])
+    assert [c['id'] for c in rest] == ['c4']
+    assert get_pending_comics(limit=2, conn=test_db, after_id='c4') == []
+
 def test_create_series_with_metadata(test_db):
     """Test creating a series with all metadata fields"""
     metadata = {
@@ -302,3 +322,140 @@ def test_user_preferences_defaults(test_db):
     assert prefs_updated['brightness'] == 1.2
     assert prefs_updated['contrast'] == 0.9
     assert prefs_updated['saturation'] == 1.0
+
+
+def test_get_all_series_with_total(test_db):
+    for i in range(5):
+        test_db.execute("INSERT INTO series (name, category) VALUES (?, ?)", (f"Series {i}", "Manga" if i < 3 else "Comics"))
+    test_db.commit()
+    
+    page, total = get_all_series(limit=2, offset=0, with_total=True)
+    assert total == 5
+    assert [s['name'] for s in page] == ["Series 0", "Series 1"]
+    assert '_total' not in page[0]
+    
+    page, total = get_all_series(category="Manga", limit=2, offset=2, with_total=True)
+    assert total == 3
+    assert len(page) == 1
+    
+    page, total = get_all_series(limit=2, offset=10, with_total=True)
+    assert page == []
+    assert total == 5
+
+
+def test_connection_pool_reuses_connections(tmp_path):
+    from db.connection import ConnectionPool
+    pool = ConnectionPool(str(tmp_path / "pool.db"))
+    
+    conn = pool.get()
+    raw = conn._conn
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1
+    assert conn.execute('PRAGMA temp_store').fetchone()[0] == 2
+    conn.execute('CREATE TABLE t (x INTEGER)')
+    conn.commit()
+    conn.execute('INSERT INTO t VALUES (1)')
+    conn.close()
+    conn.close()
+    
+    # Returned connection is reused, with uncommitted work rolled back
+    again = pool.get()
+    assert again._conn is raw
+    assert again.execute('SELECT COUNT(*) FROM t').fetchone()[0] == 0
+    
+    # Session pragmas set by one caller don't leak to the next checkout
+    again.execute('PRAGMA foreign_keys = ON')
+    again.close()
+    again = pool.get()
+    assert again._conn is raw
+    assert again.execute('PRAGMA foreign_keys').fetchone()[0] == 0
+    
+    # Nested checkouts never share a connection
+    nested = pool.get()
+    assert nested._conn is not raw
+    nested.close()
+    again.close()
+    
+    with pytest.raises(sqlite3.ProgrammingError):
+        again.execute('SELECT 1')
+
+
+def test_get_all_series_cache_invalidation(test_db):
+    create_or_update_series("Cached A", {"status": "Finished"}, category="Manga", conn=test_db)
+    test_db.commit()
+    assert [s['name'] for s in get_all_series()] == ["Cached A"]
+    
+    # Callers get copies, so mutating a result leaves the cache intact
+    first = get_all_series()
+    first[0]['name'] = "Mutated"
+    first.append({'name': "Extra"})
+    paged, _ = get_all_series(with_total=True)
+    paged[0]['name'] = "Mutated"
+    assert [s['name'] for s in get_all_series()] == ["Cached A"]
+    assert [s['name'] for s in get_all_series(with_total=True)[0]] == ["Cached A"]
+    
+    # Direct writes are not seen until the cache is invalidated
+    test_db.execute("INSERT INTO series (name, category) VALUES (?, ?)", ("Cached B", "Manga"))
+    test_db.commit()
+    assert [s['name'] for s in get_all_series()] == ["Cached A"]
+    
+    invalidate_series_list_cache()
+    assert [s['name'] for s in get_all_series()] == ["Cached A", "Cached B"]
+    
+    # Writes through the series helpers invalidate automatically
+    create_or_update_series("Cached C", {"status": "Publishing"}, category="Manga", conn=test_db)
+    test_db.commit()
+    assert len(get_all_series()) == 3
+    
+    invalidate_tag_cache()
+    assert get_series_metadata()["statuses"] == ["Finished", "Publishing"]
+
+
+def test_upsert_series_batch(test_db):
+    existing_id = create_or_update_series(
+        "Batch A", {"synopsis": "Kept", "genres": ["Action"]}, category="Manga", conn=test_db
+    )
+    
+    ids = upsert_series_batch([
+        ("Batch A", {"status": "Finished"}, "Manga", None, "c1"),
+        ("Batch B", {"genres": ["Drama"], "is_adult": True}, "Comics", "Indie", "c2"),
+    ], conn=test_db)
+    test_db.commit()
+    
+    assert ids["Batch A"] == existing_id
+    assert set(ids) == {"Batch A", "Batch B"}
+    
+    a = get_series_by_name("Batch A")
+    assert a['synopsis'] == "Kept"
+    assert a['genres'] == '["Action"]'
+    assert a['status'] == "Finished"
+    assert a['cover_comic_id'] == "c1"
+    
+    b = get_series_by_name("Batch B")
+    assert b['id'] == ids["Batch B"]
+    assert b['genres'] == '["Drama"]'
+    assert b['subcategory'] == "Indie"
+    assert b['is_adult'] == 1
+    
+    assert upsert_series_batch([], conn=test_db) == {}
+
+def test_filter_and_recent_progress_queries_use_indexes(test_db):
+    def plan(sql, params):
+        return " ".join(row[3] for row in test_db.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall())
+    
+    assert "idx_series_cat_sub" in plan(
+        "SELECT * FROM series WHERE category = ? AND subcategory = ? ORDER BY name LIMIT 10",
+        ("Manga", "Action")
+    )
+    recent = plan(
+        "SELECT comic_id FROM reading_progress WHERE user_id = ? ORDER BY last_read DESC LIMIT 12",
+        (1,)
+    )
+    assert "idx_rp_user_lastread" in recent
+    assert "TEMP B-TREE" not in recent
+    gaps = plan(
+        "SELECT series, volume, chapter, filename FROM comics WHERE series IS NOT NULL ORDER BY series, volume, chapter",
+        ()
+    )
+    assert "idx_comics_series_vol_ch" in gaps
+    assert "TEMP B-TREE" not in gaps
@@ -148,6 +148,26 @@ def test_add_series_to_list(test_db, test_user):
     assert items[0]['position'] == 0
 
 
+def test_list_item_count_tracks_items(test_db, test_user):
+    """Test user_lists.item_count follows adds and removes"""
+    import db.lists
+    
+    list_id = db.lists.create_list(test_user['id'], "Counted List", None, False)
+    series_ids = [
+        test_db.execute("INSERT INTO series (name) VALUES (?) RETURNING id", (name,)).fetchone()['id']
+        for name in ("Count A", "Count B")
+    ]
+    
+    for series_id in series_ids:
+        assert db.lists.add_series_to_list(list_id, series_id) is True
+    lists = db.lists.get_user_lists(test_user['id'])
+    assert lists[0]['item_count'] == 2
+    
+    db.lists.remove_series_from_list(list_id, series_ids[0])
+    lists = db.lists.get_user_lists(test_user['id'])
+    assert lists[0]['item_count'] == 1
+
+
 def test_public_lists_excludes_private(test_db, test_user):
     """Test public lists excludes private lists"""
     import db.lists
@@ -0,0 +1,129 @@
+import os
+import hashlib
+import pytest
+import db.connection
+import db.nsfw
+import scanner.tasks
+from scanner.utils import walk_files, walk_files_parallel
+from scanner.tasks import _comic_id, sync_library_task
+from db.users import create_user
+
+
+def _listing(walk):
+    return [(os.path.basename(root), sorted(entry.name for entry in files)) for root, files in walk]
+
+
+def test_walk_files_parallel_matches_walk_files(tmp_path):
+    for category in ["Manga", "Comics", "Webtoons"]:
+        (tmp_path / category / "Series" / "Extras").mkdir(parents=True)
+        (tmp_path / category / "Series" / "v01.cbz").write_bytes(b"x")
+        (tmp_path / category / "Series" / "Extras" / "bonus.cbr").write_bytes(b"x")
+    (tmp_path / "loose.cbz").write_bytes(b"x")
+    
+    expected = _listing(walk_files(str(tmp_path)))
+    for workers in (1, 2, 8):
+        assert _listing(walk_files_parallel(str(tmp_path), max_workers=workers)) == expected
+    
+    # Top-down: every directory is yielded after its parent
+    seen = set()
+    for root, _ in walk_files_parallel(str(tmp_path)):
+        assert root == str(tmp_path) or os.path.dirname(root) in seen
+        seen.add(root)
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="symlinks not supported")
+def test_walk_files_lists_symlinks_without_following_dirs(tmp_path):
+    real = tmp_path / "Manga"
+    real.mkdir()
+    (real / "v01.cbz").write_bytes(b"x")
+    try:
+        (tmp_path / "Linked").symlink_to(real, target_is_directory=True)
+        (tmp_path / "alias.cbz").symlink_to(real / "v01.cbz")
+    except OSError:
+        pytest.skip("symlinks not permitted")
+    
+    listing = dict(_listing(walk_files_parallel(str(tmp_path))))
+    # Symlinked files are listed like os.walk does; symlinked dirs aren't walked
+    assert listing[tmp_path.name] == ["alias.cbz"]
+    assert "Linked" not in listing
+    assert listing["Manga"] == ["v01.cbz"]
+
+
+def test_sync_library_task_keeps_ids_and_detects_changes(test_db, tmp_path, monkeypatch):
+    library = tmp_path / "library"
+    series_dir = library / "Manga" / "Shonen" / "Hero"
+    series_dir.mkdir(parents=True)
+    for name in ["Hero v01.cbz", "Hero v02.cbz", "Hero v03.cbz"]:
+        (series_dir / name).write_bytes(b"original")
+    
+    monkeypatch.setattr(scanner.tasks, "_comics_dir", str(library))
+    monkeypatch.setattr(scanner.tasks, "_comics_prefix_len", len(os.path.join(str(library), "")))
+    monkeypatch.setattr(scanner.tasks, "get_db_connection", db.connection.get_db_connection)
+    monkeypatch.setattr(db.nsfw, "recompute_nsfw_flags", lambda: None)
+    
+    def comics():
+        rows = test_db.execute("SELECT path, id, series, processed FROM comics").fetchall()
+        return {os.path.basename(row['path']): dict(row) for row in rows}
+    
+    assert sync_library_task() == (3, 0)
+    first = comics()
+    assert {c['id'] for c in first.values()} == {_comic_id(str(series_dir / name)) for name in first}
+    assert {c['series'] for c in first.values()} == {"Hero"}
+    
+    # An unchanged library is a no-op and keeps every id
+    assert sync_library_task() == (0, 0)
+    assert comics() == first
+    
+    # Stored ids are reused by path even when they don't match the current hash
+    test_db.execute("UPDATE comics SET processed = 1")
+    test_db.execute("UPDATE comics SET id = 'legacy-md5-id' WHERE path = ?", (str(series_dir / "Hero v03.cbz"),))
+    test_db.commit()
+    
+    (series_dir / "Hero v01.cbz").write_bytes(b"rewritten and longer")
+    (series_dir / "Hero v02.cbz").unlink()
+    assert sync_library_task() == (1, 1)
+    
+    after = comics()
+    assert set(after) == {"Hero v01.cbz", "Hero v03.cbz"}
+    assert after["Hero v01.cbz"]['id'] == first["Hero v01.cbz"]['id']
+    assert after["Hero v01.cbz"]['processed'] == 0
+    assert after["Hero v03.cbz"]['id'] == 'legacy-md5-id'
+    assert after["Hero v03.cbz"]['processed'] == 1
+
+
+def test_sync_library_task_reattaches_data_when_a_file_returns(test_db, tmp_path, monkeypatch):
+    library = tmp_path / "library"
+    series_dir = library / "Manga" / "Shonen" / "Hero"
+    series_dir.mkdir(parents=True)
+    comic_path = series_dir / "Hero v01.cbz"
+    comic_path.write_bytes(b"original")
+    
+    monkeypatch.setattr(scanner.tasks, "_comics_dir", str(library))
+    monkeypatch.setattr(scanner.tasks, "_comics_prefix_len", len(os.path.join(str(library), "")))
+    monkeypatch.setattr(scanner.tasks, "get_db_connection", db.connection.get_db_connection)
+    monkeypatch.setattr(db.nsfw, "recompute_nsfw_flags", lambda: None)
+    
+    assert sync_library_task() == (1, 0)
+    comic_id = test_db.execute("SELECT id FROM comics").fetchone()['id']
+    assert comic_id == hashlib.md5(str(comic_path).encode('utf-8')).hexdigest()
+    
+    user_id = create_user('returning', 'password123', 'returning@test.com', 'reader')
+    test_db.execute(
+        'INSERT INTO reading_progress (user_id, comic_id, current_page, total_pages) VALUES (?, ?, ?, ?)',
+        (user_id, comic_id, 7, 20)
+    )
+    test_db.commit()
+    
+    # The share goes away, then comes back with the same file
+    moved = tmp_path / "offline.cbz"
+    comic_path.rename(moved)
+    assert sync_library_task() == (0, 1)
+    assert test_db.execute("SELECT COUNT(*) FROM comics").fetchone()[0] == 0
+    
+    moved.rename(comic_path)
+    assert sync_library_task() == (1, 0)
+    assert test_db.execute("SELECT id FROM comics").fetchone()['id'] == comic_id
+    progress = test_db.execute(
+        'SELECT current_page FROM reading_progress WHERE user_id = ? AND comic_id = ?', (user_id, comic_id)
+    ).fetchone()
+    assert progress['current_page'] == 7
@@ -24,3 +24,18 @@ def test_auth_flow(test_client, test_user):
     user_data = me_response.json()
     assert user_data["username"] == "newuser"
     assert user_data["role"] == "reader"
+
+def test_routes_use_typed_json_fast_path():
+    """Every API route declares a return type and keeps the default response class,
+    so FastAPI serializes through Pydantic's Rust JSON encoder."""
+    import inspect
+    from fastapi.routing import APIRoute
+    from fastapi.datastructures import DefaultPlaceholder
+    from server import app
+    
+    for route in app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        annotation = inspect.signature(route.endpoint).return_annotation
+        assert annotation is not inspect.Signature.empty, f"{route.path} has no return annotation"
+        assert isinstance(route.response_class, DefaultPlaceholder), f"{route.path} overrides response_class"